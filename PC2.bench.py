@@ -0,0 +1,27 @@
+import sys
+
+import pc2.bench
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+# Size of the synthetic log (200k lines ≈ 45 MB) and runs per stage (best is kept)
+N_LINES = 200_000
+SEED = 0
+REPEAT = 3
+# Baseline numbers to compare against. Timings depend on the machine, so
+# compare runs on the same PC. Run with --save to replace the baseline.
+BASELINE_PATH = "bench_baseline.json"
+
+if __name__ == "__main__":
+    report = pc2.bench.run_benchmarks(N_LINES, SEED, REPEAT)
+    baseline = pc2.bench.load_baseline(BASELINE_PATH)
+    regressions = pc2.bench.print_report(report, baseline)
+
+    if "--save" in sys.argv or baseline is None:
+        pc2.bench.save_baseline(report, BASELINE_PATH)
+    elif regressions:
+        print(f"⚠ {len(regressions)} stages slower than baseline x{pc2.bench.REGRESSION_FACTOR}")
+        sys.exit(1)
+    else:
+        print("🎉 No stage slower than the baseline")
@@ -0,0 +1,36 @@
+import glob
+import os
+
+import pc2
+import pc2.rollups
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+db_path = r"D:\VLBI\PyCharmMiscProject\VLBI.test2.db"
+
+# Local copies of PC1 logs, appended oldest first. Sorting by file name must
+# give chronological order: lines older than a table's checkpoint are skipped,
+# so backfill older files before newer ones (or into an empty DB).
+LOG_FILES = sorted(glob.glob(r"D:\VLBI\logs\*.log"))
+WORKERS = os.cpu_count()
+
+SUBSYSTEMS = list(pc2.SUBSYSTEMS)
+# True: bring the per-minute/per-hour rollup tables (pc2.rollups) up to date
+# after the backfill
+ROLLUPS = False
+
+# Worker processes re-import this file, so everything runs under the main guard
+if __name__ == "__main__":
+    conn = pc2.connect(db_path)
+
+    for path in LOG_FILES:
+        print(f"Parsing {path} with {WORKERS} workers...")
+        checkpoints = pc2.load_checkpoints(conn)
+        tables = pc2.parse_file_parallel(path, SUBSYSTEMS, checkpoints, workers=WORKERS)
+        pc2.append_tables(conn, tables, checkpoints)
+
+    if ROLLUPS:
+        pc2.rollups.update_rollups(conn)
+    conn.close()
+    print(f"🎉 Backfilled {len(LOG_FILES)} log files!")
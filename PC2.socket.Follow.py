@@ -0,0 +1,37 @@
+import pc2
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+PC1_IP = "192.168.0.50"
+PC1_PORT = 6000
+
+db_path = r"D:\VLBI\PyCharmMiscProject\VLBI.test2.db"
+
+# Subsystems kept up to date (see pc2.SUBSYSTEMS)
+SUBSYSTEMS = list(pc2.SUBSYSTEMS)
+
+# Commit after this many lines or this many milliseconds, whichever comes first
+BATCH_LINES = 200
+BATCH_MS = 500
+# Seconds to wait before reconnecting after PC1 closes the connection
+RECONNECT_S = 1.0
+# True: update the per-minute/per-hour rollup tables (pc2.rollups) after every batch
+ROLLUPS = False
+
+# ============================================================
+# Follow PC1 and append new lines as they arrive
+# ============================================================
+# Runs until interrupted with Ctrl+C. Tables and checkpoints are shared with
+# the incremental mode of the other scripts.
+# New lines arrive within about a second only with TRANSFER_NEGOTIATION
+# (pc2/config.py) and a PC1 sender that answers the hello. Otherwise every
+# reconnect transfers and scans the whole PC1 log again.
+conn = pc2.connect(db_path)
+try:
+    pc2.follow(conn, SUBSYSTEMS, PC1_IP, PC1_PORT,
+               batch_lines=BATCH_LINES, batch_ms=BATCH_MS, reconnect_s=RECONNECT_S, rollups=ROLLUPS)
+except KeyboardInterrupt:
+    print("Stopped following PC1.")
+finally:
+    conn.close()
@@ -0,0 +1,159 @@
+import pc2
+import pc2.normalized
+import pc2.partitions
+import pc2.rollups
+import pc2.runs
+import pc2.search
+import pc2.shards
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+PC1_IP = "192.168.0.50"
+PC1_PORT = 6000
+
+db_path = r"D:\VLBI\PyCharmMiscProject\VLBI.test2.db"
+# True: append only lines newer than the checkpoint stored in the DB.
+# False: drop and rebuild the tables from the whole log.
+INCREMENTAL = False
+# 1: parse while receiving. >1: receive the whole log, then parse it in this
+# many worker processes (worth it for multi-hundred-MB logs).
+WORKERS = 1
+# True: parse with the column-wise engine (pc2.vectorized, needs pyarrow and
+# numpy) after receiving the whole log. Same tables, faster on large logs.
+VECTORIZED = False
+# True: receive the whole log and parse the raw bytes (pc2.parse_buffer),
+# decoding only Event messages and the data of the routed lines. The worker
+# processes (WORKERS > 1) always parse this way.
+PARSE_BYTES = False
+# True: also write every table as Parquet under pc2.config.PARQUET_DIR
+# (partitioned by subsystem and date; needs pyarrow).
+PARQUET_EXPORT = False
+# Tables stored change-only as "<table>_runs" (pc2.runs): one row per run of
+# identical values, expanded back to samples by the "<table>_expanded" view.
+# e.g. ["IFselector", "VideoConverter2"]; [] stores every table per sample.
+RUN_LENGTH_TABLES = []
+# True: keep per-minute/per-hour min/max/mean/count rollups of every numeric
+# column ("<table>_rollup_1m" / "_1h", pc2.rollups) up to date after storing.
+ROLLUPS = False
+# True: store KDown/QDown/SXDown in one "downconverter" table and the four
+# frontend_<band> tables in one "frontend" table, a row per (ts, band,
+# channel) instead of per line (pc2.normalized).
+NORMALIZED_LAYOUT = False
+# True: write into one DB file per log date under pc2.config.PARTITION_DIR
+# (pc2.partitions) instead of db_path, and seal (vacuum, make read-only) the
+# partitions of days before the newest one. Query them with
+# pc2.partitions.attach_range / read_range.
+PARTITIONED = False
+# True: write each subsystem's tables into its own DB file under
+# pc2.config.SHARD_DIR, one writer process per subsystem (pc2.shards), instead
+# of db_path; pc2.shards.open_catalog() reads them all through one connection.
+# Tables are stored per sample (RUN_LENGTH_TABLES, ROLLUPS and
+# NORMALIZED_LAYOUT apply to the single-file and PARTITIONED modes); the
+# EVENT_SEARCH_INDEX is built in the Event shard.
+SHARDED = False
+# True: keep the Event_fts full-text index over Event.message up to date
+# (pc2.search); once created, its triggers also index the Follow/Backfill appends.
+EVENT_SEARCH_INDEX = True
+
+# Every subsystem table is written from a single download and a single scan:
+# Frontend [12], KDown [11], QDown [14], SXDown [13], IFselector [15],
+# VideoConverter2 [4] and Event (WARN/DEBUG/ERROR on any thread).
+SUBSYSTEMS = list(pc2.SUBSYSTEMS)
+
+
+# ============================================================
+# Storage layouts (used by STEP 3)
+# ============================================================
+# Tables kept in another layout → that layout's checkpoint, loaded in place
+# of the per-sample table's
+stored_in = pc2.runs.runs_stored_in(RUN_LENGTH_TABLES)
+if NORMALIZED_LAYOUT:
+    stored_in.update(pc2.normalized.NORMALIZED_STORED_IN)
+
+
+def store(conn, tables, checkpoints):
+    normalized = pc2.normalized.NORMALIZED_SOURCES if NORMALIZED_LAYOUT else {}
+    normalized_tables = {name: rows for name, rows in tables.items() if name in normalized}
+    run_tables = {name: rows for name, rows in tables.items()
+                  if name in RUN_LENGTH_TABLES and name not in normalized}
+    sample_tables = {name: rows for name, rows in tables.items()
+                     if name not in normalized_tables and name not in run_tables}
+    if INCREMENTAL:
+        pc2.append_tables(conn, sample_tables, checkpoints)
+        if run_tables:
+            pc2.runs.append_runs(conn, run_tables, checkpoints)
+        if normalized_tables:
+            pc2.normalized.append_normalized(conn, normalized_tables)
+    else:
+        pc2.write_tables(conn, sample_tables)
+        if run_tables:
+            pc2.runs.write_runs(conn, run_tables)
+        if normalized_tables:
+            pc2.normalized.write_normalized(conn, normalized_tables)
+    if ROLLUPS:
+        pc2.rollups.update_rollups(conn, list(sample_tables))
+    if EVENT_SEARCH_INDEX and "Event" in sample_tables:
+        pc2.search.create_event_index(conn)
+
+
+# Worker processes re-import this file, so everything runs under the main guard
+if __name__ == "__main__":
+    if PARTITIONED:
+        checkpoints = pc2.partitions.load_partition_checkpoints(stored_in=stored_in) if INCREMENTAL else None
+    elif SHARDED:
+        checkpoints = pc2.shards.load_shard_checkpoints() if INCREMENTAL else None
+    else:
+        conn = pc2.connect(db_path)
+        checkpoints = pc2.load_checkpoints(conn, stored_in) if INCREMENTAL else None
+
+    # ============================================================
+    # STEP 1 & 2: Receive log file from PC1 and parse every line once
+    # ============================================================
+    if VECTORIZED:
+        from pc2.vectorized import parse_lines_vectorized
+
+        lines = pc2.decode_log(pc2.receive_log(PC1_IP, PC1_PORT))
+        tables = parse_lines_vectorized(lines, SUBSYSTEMS, checkpoints)
+    elif WORKERS > 1:
+        buffer = pc2.receive_log(PC1_IP, PC1_PORT)
+        tables = pc2.parse_parallel(buffer, SUBSYSTEMS, checkpoints, workers=WORKERS)
+    elif PARSE_BYTES:
+        buffer = pc2.receive_log(PC1_IP, PC1_PORT)
+        tables = pc2.parse_buffer(buffer, SUBSYSTEMS, checkpoints)
+    else:
+        # Lines are decoded and parsed as they arrive.
+        lines = pc2.receive_lines(PC1_IP, PC1_PORT)
+        tables = pc2.parse_lines(lines, SUBSYSTEMS, checkpoints)
+
+    for table_name, rows in tables.items():
+        print(f"Parsed {len(rows)} rows for {table_name}")
+
+    # ============================================================
+    # STEP 3: Insert into SQLite
+    # ============================================================
+    if PARTITIONED:
+        dates = []
+        for date, partition_conn, day_tables in pc2.partitions.open_partitions(tables):
+            # Each partition resumes from its own checkpoints
+            store(partition_conn, day_tables, pc2.load_checkpoints(partition_conn, stored_in) if INCREMENTAL else None)
+            dates.append(date)
+        if dates:
+            pc2.partitions.seal_partitions(max(dates))
+    elif SHARDED:
+        pc2.shards.write_shards(tables, incremental=INCREMENTAL)
+        if EVENT_SEARCH_INDEX and "Event" in tables:
+            # The index lives in the Event shard, next to the table it reads
+            event_conn = pc2.connect(pc2.shards.shard_path("Event"))
+            pc2.search.create_event_index(event_conn)
+            event_conn.close()
+    else:
+        store(conn, tables, checkpoints)
+        conn.close()
+
+    if PARQUET_EXPORT:
+        from pc2.parquet import write_parquet
+
+        write_parquet(tables, checkpoints=checkpoints)
+
+    print("🎉 All subsystem tables extracted in one pass!")
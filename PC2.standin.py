@@ -0,0 +1,46 @@
+import pc2.standin
+import pc2.synthetic
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+# Listen address; set PC1_IP = "127.0.0.1" (and PC1_PORT) in a PC2 script to
+# ingest from this stand-in instead of the instrument PC.
+HOST = "0.0.0.0"
+PORT = 6000
+
+# Log to serve: a file recorded from PC1, or None for a synthetic log
+LOG_FILE = None
+N_LINES = 100_000
+SEED = 0
+
+# Link simulation (None / 0 turns each one off)
+BANDWIDTH = None  # bytes per second, e.g. 2_000_000
+LATENCY_MS = 0
+CHUNK_RANGE = None  # (min, max) bytes per send, e.g. (1, 4097)
+DROP_RATIO = 0.0  # share of connections cut at a random offset
+DROP_RESET = False  # cut with a TCP reset instead of a normal close
+
+# Compressed transfer offered to clients that negotiate (pc2.config.TRANSFER_NEGOTIATION):
+# None offers every available encoding, [] only the plain log.
+ENCODINGS = None
+
+if __name__ == "__main__":
+    if LOG_FILE:
+        with open(LOG_FILE, "rb") as f:
+            data = f.read()
+    else:
+        data = pc2.synthetic.generate_log(N_LINES, SEED)
+
+    server = pc2.standin.StandInServer(
+        data, (HOST, PORT), bandwidth=BANDWIDTH, latency_s=LATENCY_MS / 1000, chunk_range=CHUNK_RANGE,
+        drop_ratio=DROP_RATIO, drop_reset=DROP_RESET, seed=SEED, encodings=ENCODINGS,
+    )
+    print(f"Serving {len(data)} bytes on {HOST}:{PORT} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    print(f"Served {server.connections} connections")
@@ -0,0 +1,6 @@
+from .config import PC1_IP, PC1_PORT, DB_PATH
+from .receive import receive_lines, receive_log, follow_lines, decode_lines, decode_log
+from .parsers import SUBSYSTEMS, TABLE_COLUMNS, TABLE_TYPES, epoch_ms, parse_lines, parse_buffer
+from .storage import connect, create_table, create_indexes, insert_rows, write_tables, load_checkpoints, append_tables
+from .follow import follow
+from .parallel import parse_parallel, parse_file_parallel
@@ -0,0 +1,60 @@
+from .parsers import TABLE_COLUMNS
+from .storage import _time_filter
+
+# ============================================================
+# As-of join: subsystem state at the time of each event
+# ============================================================
+# For every event time, the newest sample of a table with ts <= that time
+# (the "as of" value), e.g. the KDown/QDown LOCK, IFselector LEVEL and
+# frontend cryo temperatures when an ERROR was logged:
+#
+#     pc2.asof.events_with_samples(conn, {
+#         "KDown": ["K1LOCK", "K2LOCK", "K3LOCK", "K4LOCK"],
+#         "IFselector": ["CH1LEVEL", "CH2LEVEL"],
+#         "frontend_22ghz": ["Cryo_ColdPla", "Cryo_ShieldBox"],
+#     }, t0=t0, t1=t1, levels=["ERROR"])
+#
+# Each lookup is one descending seek on the table's ts index (a binary
+# search in the B-tree), so the cost grows with the number of distinct event
+# times and only logarithmically with the number of samples; nothing
+# between the events is read.
+
+
+def asof_samples(conn, times, table_name, columns=None, max_age_ms=None):
+    # → one (ts, *columns) row per entry of `times`: the newest sample at or
+    # before that time (among samples sharing a ts, the last stored), or None
+    # if there is none or it is older than max_age_ms.
+    columns = columns or TABLE_COLUMNS[table_name][1:]
+    sql = (
+        f"SELECT ts, {', '.join(columns)} FROM {table_name} "
+        "WHERE ts <= ? ORDER BY ts DESC, rowid DESC LIMIT 1"
+    )
+    found = {}
+    for t in sorted(set(times)):
+        row = conn.execute(sql, (t,)).fetchone()
+        if row is not None and max_age_ms is not None and t - row[0] > max_age_ms:
+            row = None
+        found[t] = row
+    return [found[t] for t in times]
+
+
+def events_with_samples(conn, tables, t0=None, t1=None, levels=None, max_age_ms=None):
+    # Event rows with t0 <= ts <= t1 and level in `levels` (None: any), in ts
+    # order, each with the as-of sample of every table:
+    # → [(event_row, {table_name: (ts, *columns) or None})]
+    # `tables` maps table names to the columns wanted (None: all of them).
+    where, params = _time_filter(t0, t1, levels)
+    sql = "SELECT * FROM Event"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    events = conn.execute(sql + " ORDER BY ts", params).fetchall()
+
+    times = [event[0] for event in events]
+    samples = {
+        table_name: asof_samples(conn, times, table_name, columns, max_age_ms)
+        for table_name, columns in tables.items()
+    }
+    return [
+        (event, {table_name: samples[table_name][i] for table_name in tables})
+        for i, event in enumerate(events)
+    ]
@@ -0,0 +1,148 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+
+from .parsers import SUBSYSTEMS, parse_lines
+from .receive import receive_log, decode_log
+from .standin import start_server
+from .storage import connect, write_tables
+from .synthetic import generate_log
+
+# ============================================================
+# Stage benchmarks
+# ============================================================
+# Times each stage of an ingest on a synthetic log:
+#   receive   - download the raw log from the local PC1 stand-in (pc2.receive_log)
+#   decode    - CP949 bytes → lines (pc2.decode_log)
+#   match     - parse_lines with the row builders switched off: prefilter,
+#               header regex, timestamps and routing
+#   row_build - the rest of parse_lines (full parse minus match)
+#               Event rows are built inside parse_lines (Event has no row
+#               builder to switch off), so Event's match includes them and
+#               its row_build is about 0.
+#   insert    - write_tables into a fresh SQLite file
+# receive and decode are the same for every script, so they are timed once
+# under "all". Every stage is the best of `repeat` runs, in seconds.
+
+# Subsystems parsed by each PC2 script
+SCRIPTS = {
+    "Ingest": list(SUBSYSTEMS),
+    "Frontend": ["Frontend"],
+    "Kdown": ["KDown"],
+    "Qdown": ["QDown"],
+    "SXdown": ["SXDown"],
+    "IFselector": ["IFselector"],
+    "Videoconverter2": ["VideoConverter2"],
+    "Event": ["Event"],
+}
+
+# A stage slower than baseline × this factor is reported as a regression
+REGRESSION_FACTOR = 1.25
+
+
+def _best_of(repeat, func):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+@contextlib.contextmanager
+def _row_builders_disabled():
+    parsers = {name: sub["parse"] for name, sub in SUBSYSTEMS.items()}
+    try:
+        for sub in SUBSYSTEMS.values():
+            if sub["parse"] is not None:
+                sub["parse"] = lambda e, tables: None
+        yield
+    finally:
+        for name, parse in parsers.items():
+            SUBSYSTEMS[name]["parse"] = parse
+
+
+def _insert(tables):
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = connect(os.path.join(tmp, "bench.db"))
+        try:
+            write_tables(conn, tables)
+        finally:
+            conn.close()
+
+
+def run_benchmarks(n_lines=200_000, seed=0, repeat=3, scripts=None):
+    # → {"config": {...}, "results": {script: {stage: seconds}}}
+    scripts = scripts or list(SCRIPTS)
+    data = generate_log(n_lines, seed)
+    results = {}
+    # The stages print their usual progress messages; keep the report readable.
+    server, (ip, port) = start_server(data, handshake_s=0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            receive_s, buffer = _best_of(repeat, lambda: receive_log(ip, port))
+        finally:
+            server.shutdown()
+            server.server_close()
+        decode_s, lines = _best_of(repeat, lambda: decode_log(buffer))
+        results["all"] = {"receive": receive_s, "decode": decode_s}
+
+        for script in scripts:
+            subsystems = SCRIPTS[script]
+            with _row_builders_disabled():
+                match_s, _ = _best_of(repeat, lambda: parse_lines(lines, subsystems))
+            parse_s, tables = _best_of(repeat, lambda: parse_lines(lines, subsystems))
+            insert_s, _ = _best_of(repeat, lambda: _insert(tables))
+            results[script] = {
+                "match": match_s,
+                "row_build": max(parse_s - match_s, 0.0),
+                "insert": insert_s,
+                "rows": sum(len(rows) for rows in tables.values()),
+            }
+
+    config = {"n_lines": n_lines, "seed": seed, "repeat": repeat, "bytes": len(data)}
+    return {"config": config, "results": results}
+
+
+def print_report(report, baseline=None):
+    # One line per script and stage; with a baseline, the ratio to it and a
+    # REGRESSION mark when slower than REGRESSION_FACTOR.
+    config = report["config"]
+    print(f"Synthetic log: {config['n_lines']} lines, {config['bytes'] / 1e6:.1f} MB (seed {config['seed']})")
+    if baseline is not None and any(baseline["config"][k] != config[k] for k in ("n_lines", "seed")):
+        print("⚠ Baseline was measured on a different synthetic log; not comparing")
+        baseline = None
+    regressions = []
+    for script, stages in report["results"].items():
+        for stage, seconds in stages.items():
+            if stage == "rows":
+                continue
+            line = f"{script:16} {stage:10} {seconds * 1000:10.1f} ms"
+            base = (baseline or {}).get("results", {}).get(script, {}).get(stage)
+            if base:
+                ratio = seconds / base
+                line += f"  x{ratio:.2f} vs baseline"
+                if ratio > REGRESSION_FACTOR:
+                    line += "  ⚠ REGRESSION"
+                    regressions.append((script, stage))
+            print(line)
+    return regressions
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(report, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    print(f"Saved baseline to {os.path.abspath(path)}")
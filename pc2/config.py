@@ -0,0 +1,59 @@
+# ============================================================
+# CONFIGURATION shared by every PC2 ingest script
+# ============================================================
+PC1_IP = "192.168.0.50"
+PC1_PORT = 6000
+
+DB_PATH = r"D:\VLBI\PyCharmMiscProject\VLBI.test2.db"
+# Optional Parquet export (pc2.parquet): one dataset per table under this folder
+PARQUET_DIR = r"D:\VLBI\PyCharmMiscProject\parquet"
+# Optional per-day partition files (pc2.partitions): VLBI.<YYYY-MM-DD>.db in this folder
+PARTITION_DIR = r"D:\VLBI\PyCharmMiscProject\partitions"
+# Optional per-subsystem shard files and their catalog (pc2.shards)
+SHARD_DIR = r"D:\VLBI\PyCharmMiscProject\shards"
+
+# PC1 log timestamps are local time (KST, UTC+9); ts columns hold UTC epoch ms
+LOG_UTC_OFFSET_S = 9 * 3600
+
+# Thread IDs written by the PC1 control software
+FRONTEND_THREAD_ID = '12'
+KDOWN_THREAD_ID = '11'
+QDOWN_THREAD_ID = '14'
+SXDOWN_THREAD_ID = '13'
+IF_SELECTOR_THREAD_ID = '15'
+VIDEOCONVERTER2_THREAD_ID = '4'
+
+# Socket receive size; one buffer of this size is reused for every read
+RECV_SIZE = 1024 * 1024
+# PC1 writes the log in CP949 (a superset of EUC-KR)
+LOG_ENCODING = "CP949"
+# Transfer negotiation (pc2.transfer): PC2 sends a hello line asking for a
+# compressed stream (ACCEPT_ENCODINGS, best first) and, after a dropped
+# connection, for the rest of the log from the byte it stopped at.
+# False: read the plain log as the current PC1 sender sends it (it does not
+# read the hello). Only enable it against a sender that answers the hello,
+# e.g. the local stand-in (PC2.standin.py).
+TRANSFER_NEGOTIATION = False
+ACCEPT_ENCODINGS = ("zstd", "gzip", "zlib")
+# Resuming an interrupted transfer: attempts without progress before giving
+# up, and the reconnect delay (doubled after each attempt, up to the maximum)
+TRANSFER_RETRIES = 5
+TRANSFER_RECONNECT_S = 1.0
+TRANSFER_MAX_BACKOFF_S = 30.0
+
+# Follow mode: commit a batch after this many lines or milliseconds,
+# and wait this long before reconnecting when PC1 closes the connection.
+FOLLOW_BATCH_LINES = 200
+FOLLOW_BATCH_MS = 500
+FOLLOW_RECONNECT_S = 1.0
+FOLLOW_MAX_BACKOFF_S = 30.0
+
+# SQLite pragmas applied by pc2.connect. WAL lets readers (dashboards, the
+# follow mode) query while a batch is being written; NORMAL is safe with WAL.
+# A negative cache_size is in KiB (-65536 = 64 MiB).
+SQLITE_JOURNAL_MODE = "WAL"
+SQLITE_SYNCHRONOUS = "NORMAL"
+SQLITE_CACHE_SIZE = -65536
+
+# Parallel parsing: chunks per worker process (more chunks balance the load)
+CHUNKS_PER_WORKER = 4
@@ -0,0 +1,124 @@
+import time
+
+from .config import (
+    PC1_IP,
+    PC1_PORT,
+    TRANSFER_NEGOTIATION,
+    FOLLOW_BATCH_LINES,
+    FOLLOW_BATCH_MS,
+    FOLLOW_RECONNECT_S,
+    FOLLOW_MAX_BACKOFF_S,
+)
+from .parsers import SUBSYSTEMS, TS_INDEX, parse_lines
+from .receive import follow_lines
+from .rollups import update_rollups
+from .storage import (
+    load_checkpoints,
+    append_tables,
+    _checkpoint_from_table,
+    _next_checkpoint,
+    _rows_after,
+    _table_schema,
+)
+
+
+# ============================================================
+# Live follow mode
+# ============================================================
+# Keeps reading from PC1 and commits small batches. When PC1 closes the
+# connection we reconnect. With TRANSFER_NEGOTIATION, the reconnect asks PC1
+# for the log from the byte offset already read, so it only transfers the new
+# lines and LOCK/LEVEL changes reach the DB within about a second. Without it
+# PC1 sends (and we scan) the whole log on every connection, so latency grows
+# with the log size. Either way, the checkpoints loaded at connect time skip
+# every line that is already stored before its data block is parsed.
+# Within one connection the stream simply continues, so those checkpoints are
+# only applied to the lines PC1 re-sends, never between batches: a batch may
+# start with a row stamped at the same millisecond as the last stored one.
+class _ResentFilter:
+    # Drops the rows a new connection re-sends from before the reconnect.
+    # `checkpoints` shrinks as the stream moves past each table's checkpoint.
+    def __init__(self, checkpoints):
+        self.checkpoints = dict(checkpoints)
+
+    def new_rows(self, table_name, rows):
+        checkpoint = self.checkpoints.get(table_name)
+        if checkpoint is None:
+            return rows
+        last, stored_at_last = checkpoint
+        kept = _rows_after(rows, checkpoint)
+        if any(row[TS_INDEX] > last for row in rows):
+            # Past the checkpoint: the rest of this connection is new
+            del self.checkpoints[table_name]
+        else:
+            at_last = sum(1 for row in rows if row[TS_INDEX] == last)
+            kept_at_last = sum(1 for row in kept if row[TS_INDEX] == last)
+            self.checkpoints[table_name] = (last, stored_at_last - (at_last - kept_at_last))
+        return kept
+
+
+def _connect_checkpoints(conn, subsystems):
+    # Stored position of every followed table, including tables written
+    # before checkpoints existed (resumed after their newest row)
+    checkpoints = load_checkpoints(conn)
+    for name in subsystems or SUBSYSTEMS:
+        for table_name in SUBSYSTEMS[name]["tables"]:
+            if table_name not in checkpoints and _table_schema(conn, table_name):
+                checkpoint = _checkpoint_from_table(conn, table_name)
+                if checkpoint is not None:
+                    checkpoints[table_name] = checkpoint
+    return checkpoints
+
+
+def _batches(lines, batch_lines, batch_ms):
+    batch = []
+    deadline = None
+    for line in lines:
+        now = time.monotonic()
+        if line is not None:
+            batch.append(line)
+            if deadline is None:
+                deadline = now + batch_ms / 1000
+        if batch and (len(batch) >= batch_lines or now >= deadline):
+            yield batch
+            batch = []
+            deadline = None
+    if batch:
+        yield batch
+
+
+def follow(conn, subsystems=None, ip=PC1_IP, port=PC1_PORT,
+           batch_lines=FOLLOW_BATCH_LINES, batch_ms=FOLLOW_BATCH_MS,
+           reconnect_s=FOLLOW_RECONNECT_S, max_backoff_s=FOLLOW_MAX_BACKOFF_S,
+           max_connections=None, rollups=False, negotiate=TRANSFER_NEGOTIATION):
+    # Runs until interrupted (or after max_connections connections). With
+    # `rollups`, the pc2.rollups tables are updated after every batch.
+    connections = 0
+    delay = 0
+    # Log bytes read so far, where a negotiated reconnect resumes
+    position = {"offset": 0}
+    while max_connections is None or connections < max_connections:
+        time.sleep(delay)
+        connections += 1
+        # Read once per connection; afterwards kept up to date in memory
+        checkpoints = _connect_checkpoints(conn, subsystems)
+        resent = _ResentFilter(checkpoints)
+        try:
+            lines = follow_lines(ip, port, tick=batch_ms / 2000, negotiate=negotiate, position=position)
+            for batch in _batches(lines, batch_lines, batch_ms):
+                tables = parse_lines(batch, subsystems, resent.checkpoints)
+                tables = {name: resent.new_rows(name, rows) for name, rows in tables.items()}
+                inserted = append_tables(conn, tables, checkpoints, verbose=False, filtered=True)
+                for name, rows in tables.items():
+                    checkpoint = _next_checkpoint(rows, checkpoints.get(name))
+                    if checkpoint is not None:
+                        checkpoints[name] = checkpoint
+                new_rows = {name: count for name, count in inserted.items() if count}
+                if rollups and new_rows:
+                    update_rollups(conn, list(new_rows), verbose=False)
+                if new_rows:
+                    print(f"{time.strftime('%H:%M:%S')} committed {new_rows}")
+            delay = reconnect_s
+        except OSError as exc:
+            delay = min(max(delay * 2, reconnect_s), max_backoff_s)
+            print(f"⚠ Connection to PC1 failed: {exc}; retrying in {delay:.1f}s")
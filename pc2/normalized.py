@@ -0,0 +1,235 @@
+from .parsers import (
+    CHANNEL_SPECS,
+    DOWNCONVERTER_KEYS,
+    FRONTEND_BANDS,
+    FRONTEND_COLUMNS,
+    FRONTEND_CONVERTERS,
+    SQL_TYPES,
+    to_int,
+    to_text,
+)
+from .storage import (
+    CHECKPOINT_TABLE,
+    _create_checkpoint_table,
+    _rows_after,
+    _save_checkpoint,
+    _table_schema,
+    _time_filter,
+)
+
+# ============================================================
+# Normalized band/channel layout
+# ============================================================
+# KDown, QDown and SXDown have the same ATT/LEVEL/LOCK columns per channel, and
+# the four frontend_<band> tables have identical columns. In this layout they
+# are stored long instead of wide, one table each:
+#
+#     downconverter: ts, thread_id, log_level, band, channel, att, level, lock
+#     frontend:      ts, thread_id, log_level, band, <FRONTEND_COLUMNS...>
+#
+# (the log line's level is "log_level" here, "level" being a downconverter
+# value). A KDown line becomes four rows (band "K", channels K1..K4), an
+# SXDown line three (band "SX", channels S, X1, X2). Frontend has no channel,
+# so its rows are keyed by (ts, band). The (ts, band, channel) index answers
+# cross-band questions ("every LEVEL at time T") with one lookup; the
+# (band, channel, ts) index serves the time series of a single channel.
+# Each band has its own checkpoint ("downconverter:K", "frontend:22ghz", ...),
+# apart from the per-sample tables' (KDown, frontend_22ghz, ...) that the
+# single-subsystem scripts keep writing; load them under the source table
+# names, for parsing and the Parquet export, with stored_in=NORMALIZED_STORED_IN.
+DOWNCONVERTER_TABLE = "downconverter"
+FRONTEND_TABLE = "frontend"
+
+# Source (wide) table → (normalized table, band)
+NORMALIZED_SOURCES = {
+    name: (DOWNCONVERTER_TABLE, name[:-len("Down")])
+    for name, spec in CHANNEL_SPECS.items()
+    if spec["keys"] is DOWNCONVERTER_KEYS
+}
+NORMALIZED_SOURCES.update({f"frontend_{band}": (FRONTEND_TABLE, band) for band in FRONTEND_BANDS})
+# Source table → checkpoint of its band (see load_checkpoints)
+NORMALIZED_STORED_IN = {
+    name: f"{normalized_name}:{band}" for name, (normalized_name, band) in NORMALIZED_SOURCES.items()
+}
+
+NORMALIZED_HEADER = ["ts", "thread_id", "log_level", "band"]
+NORMALIZED_COLUMNS = {
+    DOWNCONVERTER_TABLE: NORMALIZED_HEADER + ["channel"] + [key for key, _, _ in DOWNCONVERTER_KEYS],
+    FRONTEND_TABLE: NORMALIZED_HEADER + FRONTEND_COLUMNS,
+}
+_HEADER_CONVERTERS = [to_int, to_int, to_text, to_text]
+NORMALIZED_CONVERTERS = {
+    DOWNCONVERTER_TABLE: _HEADER_CONVERTERS + [to_text] + [convert for _, _, convert in DOWNCONVERTER_KEYS],
+    FRONTEND_TABLE: _HEADER_CONVERTERS + FRONTEND_CONVERTERS,
+}
+NORMALIZED_TYPES = {
+    normalized_name: [SQL_TYPES[convert] for convert in converters]
+    for normalized_name, converters in NORMALIZED_CONVERTERS.items()
+}
+NORMALIZED_INDEXES = {
+    DOWNCONVERTER_TABLE: [("ts", "band", "channel"), ("band", "channel", "ts")],
+    FRONTEND_TABLE: [("ts", "band"), ("band", "ts")],
+}
+
+
+def to_normalized(table_name, rows):
+    # Rows of a source table (TABLE_COLUMNS order) → rows of its normalized table
+    normalized_name, band = NORMALIZED_SOURCES[table_name]
+    if normalized_name == FRONTEND_TABLE:
+        return [row[:3] + [band] + row[3:] for row in rows]
+
+    # Wide columns are key by key, channel by channel: K1ATT..K4ATT, K1LEVEL, ...
+    labels = CHANNEL_SPECS[table_name]["labels"]
+    normalized = []
+    for row in rows:
+        header = row[:3] + [band]
+        values = row[3:]
+        for i, label in enumerate(labels):
+            normalized.append(header + [label] + values[i::len(labels)])
+    return normalized
+
+
+def create_normalized_table(conn, normalized_name):
+    # Migrated when its columns changed (e.g. a new FRONTEND_COLUMNS entry)
+    schema = list(zip(NORMALIZED_COLUMNS[normalized_name], NORMALIZED_TYPES[normalized_name]))
+    existing = _table_schema(conn, normalized_name)
+    if existing and existing != schema:
+        _migrate_normalized_table(conn, normalized_name, existing)
+        return
+    cols_sql = ",\n    ".join(f"{col} {sql_type}" for col, sql_type in schema)
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {normalized_name} (\n    {cols_sql}\n);")
+
+
+def _migrate_normalized_table(conn, normalized_name, old_schema):
+    # Like storage._migrate_table: rebuild the table keeping every band's rows,
+    # columns matched by name and converted like freshly parsed values. The
+    # bands' checkpoints stay valid, so the stored lines are not parsed again.
+    old_columns = [col for col, _ in old_schema]
+    old_rows = conn.execute(f"SELECT * FROM {normalized_name}").fetchall()
+    conn.execute(f"DROP TABLE {normalized_name}")
+    create_normalized_table(conn, normalized_name)
+
+    columns = NORMALIZED_COLUMNS[normalized_name]
+    sources = [old_columns.index(col) if col in old_columns else None for col in columns]
+    converters = NORMALIZED_CONVERTERS[normalized_name]
+    new_rows = (
+        [None if src is None or old[src] is None else convert(old[src])
+         for src, convert in zip(sources, converters)]
+        for old in old_rows
+    )
+    _insert_normalized(conn, normalized_name, new_rows)
+    print(f"Migrated {len(old_rows)} rows of {normalized_name} to the current schema")
+
+
+def create_normalized_indexes(conn, normalized_name):
+    for cols in NORMALIZED_INDEXES[normalized_name]:
+        index_name = f"idx_{normalized_name}_{'_'.join(cols)}"
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {normalized_name} ({', '.join(cols)})")
+
+
+def _insert_normalized(conn, normalized_name, rows):
+    placeholders = ", ".join("?" for _ in NORMALIZED_COLUMNS[normalized_name])
+    conn.executemany(f"INSERT INTO {normalized_name} VALUES ({placeholders})", rows)
+
+
+def _band_checkpoint(conn, table_name):
+    # (last ts, source rows at it) of one source table, from its band's rows.
+    # Every line has one row per channel, so counting the first channel's
+    # rows counts lines (and keeps to the (band, channel, ts) index).
+    normalized_name, band = NORMALIZED_SOURCES[table_name]
+    where, params = "band = ?", [band]
+    if normalized_name == DOWNCONVERTER_TABLE:
+        where += " AND channel = ?"
+        params.append(CHANNEL_SPECS[table_name]["labels"][0])
+    (last,) = conn.execute(f"SELECT MAX(ts) FROM {normalized_name} WHERE {where}", params).fetchone()
+    if last is None:
+        return None
+    (count,) = conn.execute(
+        f"SELECT COUNT(*) FROM {normalized_name} WHERE {where} AND ts = ?", params + [last]
+    ).fetchone()
+    return (last, count)
+
+
+def write_normalized(conn, tables):
+    # Counterpart of write_tables: replaces the rows of every band in `tables`
+    # with rows, in one transaction. A band without rows (e.g. no 43GHz block
+    # in this log) keeps its stored rows and checkpoint.
+    _create_checkpoint_table(conn)
+    conn.commit()
+
+    written = {}
+    conn.execute("BEGIN")
+    try:
+        for table_name, rows in tables.items():
+            if not rows:
+                continue
+            normalized_name, band = NORMALIZED_SOURCES[table_name]
+            create_normalized_table(conn, normalized_name)
+            conn.execute(f"DELETE FROM {normalized_name} WHERE band = ?", (band,))
+            normalized = to_normalized(table_name, rows)
+            _insert_normalized(conn, normalized_name, normalized)
+            checkpoint_key = NORMALIZED_STORED_IN[table_name]
+            conn.execute(f"DELETE FROM {CHECKPOINT_TABLE} WHERE table_name = ?", (checkpoint_key,))
+            _save_checkpoint(conn, checkpoint_key, rows, None)
+            written[table_name] = len(normalized)
+        # Indexes are built once after the bulk insert rather than row by row
+        for normalized_name in {NORMALIZED_SOURCES[table_name][0] for table_name in written}:
+            create_normalized_indexes(conn, normalized_name)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    for table_name in tables:
+        if table_name in written:
+            print(f"✅ Inserted {written[table_name]} rows of {table_name} into {NORMALIZED_SOURCES[table_name][0]}")
+        else:
+            print(f"⚠ Skipping {table_name}: No data found.")
+    return written
+
+
+def append_normalized(conn, tables, verbose=True):
+    # Counterpart of append_tables. Each band resumes after its newest stored
+    # rows; its checkpoint is updated for the next parse.
+    # → {table_name: rows appended}
+    _create_checkpoint_table(conn)
+    conn.commit()
+
+    appended = {}
+    conn.execute("BEGIN")
+    try:
+        for table_name, rows in tables.items():
+            normalized_name = NORMALIZED_SOURCES[table_name][0]
+            create_normalized_table(conn, normalized_name)
+            create_normalized_indexes(conn, normalized_name)
+            checkpoint = _band_checkpoint(conn, table_name)
+            new_rows = _rows_after(rows, checkpoint)
+            normalized = to_normalized(table_name, new_rows)
+            _insert_normalized(conn, normalized_name, normalized)
+            _save_checkpoint(conn, NORMALIZED_STORED_IN[table_name], new_rows, checkpoint)
+            appended[table_name] = len(normalized)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    if verbose:
+        for table_name, count in appended.items():
+            print(f"✅ Appended {count} rows of {table_name} to {NORMALIZED_SOURCES[table_name][0]}")
+    return appended
+
+
+def read_normalized(conn, normalized_name, columns=None, t0=None, t1=None, bands=None, channels=None):
+    # Rows (`columns`, default all) of one normalized table with t0 <= ts <= t1,
+    # optionally limited to some bands/channels, ordered by ts, band(, channel)
+    where, params = _time_filter(t0, t1)
+    for col, values in (("band", bands), ("channel", channels)):
+        if values is not None:
+            where.append(f"{col} IN ({', '.join('?' for _ in values)})")
+            params.extend(values)
+    order = ["ts", "band"] + (["channel"] if normalized_name == DOWNCONVERTER_TABLE else [])
+    sql = f"SELECT {', '.join(columns or NORMALIZED_COLUMNS[normalized_name])} FROM {normalized_name}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {', '.join(order)}"
+    return conn.execute(sql, params).fetchall()
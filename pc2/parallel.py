@@ -0,0 +1,84 @@
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+
+from .config import CHUNKS_PER_WORKER
+from .parsers import SUBSYSTEMS, TS_INDEX, parse_buffer
+
+
+# ============================================================
+# Multi-process chunked parsing
+# ============================================================
+# The log is cut into line-aligned byte ranges that are parsed as raw bytes by
+# parse_buffer in worker processes; the per-table results are merged in ts
+# order. Cutting at b"\n" is safe for CP949, whose trail bytes are >= 0x41.
+#
+# Scripts that use this must keep their top-level code under
+# `if __name__ == "__main__":`, because worker processes re-import the main
+# module on Windows.
+def line_aligned_ranges(data, n_chunks):
+    size = len(data)
+    bounds = [0]
+    for i in range(1, n_chunks):
+        pos = data.find(b"\n", max(size * i // n_chunks, bounds[-1]))
+        if pos < 0:
+            break
+        if pos + 1 > bounds[-1]:
+            bounds.append(pos + 1)
+    if bounds[-1] < size:
+        bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _parse_chunk(chunk, subsystems, checkpoints):
+    return parse_buffer(chunk, subsystems, checkpoints)
+
+
+def _parse_file_range(path, start, end, subsystems, checkpoints):
+    with open(path, "rb") as f:
+        f.seek(start)
+        chunk = f.read(end - start)
+    return _parse_chunk(chunk, subsystems, checkpoints)
+
+
+def _merge(subsystems, results):
+    tables = {
+        table_name: []
+        for name in (subsystems or SUBSYSTEMS)
+        for table_name in SUBSYSTEMS[name]["tables"]
+    }
+    for part in results:
+        for table_name, rows in part.items():
+            tables[table_name].extend(rows)
+    # Chunks arrive in file order, so this stable sort is close to linear
+    for rows in tables.values():
+        rows.sort(key=itemgetter(TS_INDEX))
+    return tables
+
+
+def parse_parallel(buffer, subsystems=None, checkpoints=None, workers=None):
+    # Parse a received buffer (bytes/bytearray) in a process pool.
+    workers = workers or os.cpu_count()
+    ranges = line_aligned_ranges(buffer, workers * CHUNKS_PER_WORKER)
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [
+            pool.submit(_parse_chunk, bytes(buffer[start:end]), subsystems, checkpoints)
+            for start, end in ranges
+        ]
+        return _merge(subsystems, (future.result() for future in futures))
+
+
+def parse_file_parallel(path, subsystems=None, checkpoints=None, workers=None):
+    # Parse a local log file in a process pool; each worker reads its own range.
+    workers = workers or os.cpu_count()
+    ranges = []
+    if os.path.getsize(path):
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            ranges = line_aligned_ranges(mm, workers * CHUNKS_PER_WORKER)
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [
+            pool.submit(_parse_file_range, path, start, end, subsystems, checkpoints)
+            for start, end in ranges
+        ]
+        return _merge(subsystems, (future.result() for future in futures))
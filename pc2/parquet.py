@@ -0,0 +1,87 @@
+import os
+import time
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from .config import LOG_UTC_OFFSET_S, PARQUET_DIR
+from .parsers import TABLE_COLUMNS, TABLE_TYPES
+from .storage import _rows_after
+
+# ============================================================
+# Parquet export (optional columnar sink next to the SQLite tables)
+# ============================================================
+# Layout: <root>/subsystem=<table>/date=<YYYY-MM-DD>/part-*.parquet
+# Each table is its own Hive-partitioned dataset, one directory per log date
+# (KST, like the log itself). Parquet stores every column separately, so a
+# notebook reading one channel over weeks only touches that column's pages:
+#
+#     pc2.parquet.read_parquet("IFselector", ["ts", "CH3ATT"])
+#
+# pyarrow/numpy are only imported by this module, like pc2.vectorized.
+
+ARROW_TYPES = {"INTEGER": pa.int64(), "REAL": pa.float64(), "TEXT": pa.string()}
+DATE_PARTITIONING = ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive")
+
+
+def table_schema(table_name):
+    # Same columns and types as the SQLite table; ts as a UTC timestamp
+    fields = []
+    for col, sql_type in zip(TABLE_COLUMNS[table_name], TABLE_TYPES[table_name]):
+        arrow_type = pa.timestamp("ms", tz="UTC") if col == "ts" else ARROW_TYPES[sql_type]
+        fields.append(pa.field(col, arrow_type))
+    return pa.schema(fields)
+
+
+def _table_dir(root, table_name):
+    return os.path.join(root, f"subsystem={table_name}")
+
+
+def _to_arrow(table_name, rows):
+    schema = table_schema(table_name)
+    columns = list(zip(*rows)) if rows else [[] for _ in schema]
+    arrays = [pa.array(values, type=field.type) for values, field in zip(columns, schema)]
+    # Log date (KST) of every row, used as the partition key
+    local_ms = np.asarray(columns[0], dtype=np.int64) + LOG_UTC_OFFSET_S * 1000
+    dates = local_ms.astype("datetime64[ms]").astype("datetime64[D]").astype(str)
+    return pa.Table.from_arrays(arrays + [pa.array(dates, pa.string())], schema=schema.append(
+        pa.field("date", pa.string())))
+
+
+def write_parquet(tables, root=PARQUET_DIR, checkpoints=None, run_id=None):
+    # checkpoints=None: rewrite every date partition the parsed rows cover
+    # (the Parquet counterpart of write_tables). With the checkpoints loaded
+    # before append_tables, only the rows appended to SQLite are written, as
+    # new files next to the existing ones.
+    # run_id names the files of this run (default: current time in ms).
+    if run_id is None:
+        run_id = time.time_ns() // 1_000_000
+
+    written = {}
+    for table_name, rows in tables.items():
+        if checkpoints is not None:
+            rows = _rows_after(rows, checkpoints.get(table_name))
+        written[table_name] = len(rows)
+        if not rows:
+            continue
+        ds.write_dataset(
+            _to_arrow(table_name, rows),
+            _table_dir(root, table_name),
+            format="parquet",
+            partitioning=DATE_PARTITIONING,
+            basename_template=f"part-{run_id}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore" if checkpoints is not None else "delete_matching",
+        )
+
+    for table_name, count in written.items():
+        print(f"✅ Exported {count} rows of {table_name} to Parquet")
+    return written
+
+
+def read_parquet(table_name, columns=None, root=PARQUET_DIR, dates=None):
+    # → pyarrow.Table; columns=None reads every column, dates limits the
+    # partitions read (e.g. ["2025-03-01", "2025-03-02"]).
+    dataset = ds.dataset(_table_dir(root, table_name), format="parquet", partitioning=DATE_PARTITIONING)
+    row_filter = ds.field("date").isin(dates) if dates is not None else None
+    return dataset.to_table(columns=columns, filter=row_filter)
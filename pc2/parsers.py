@@ -0,0 +1,495 @@
+import calendar
+import math
+import re
+from collections import Counter
+
+from .config import (
+    LOG_UTC_OFFSET_S,
+    LOG_ENCODING,
+    FRONTEND_THREAD_ID,
+    KDOWN_THREAD_ID,
+    QDOWN_THREAD_ID,
+    SXDOWN_THREAD_ID,
+    IF_SELECTOR_THREAD_ID,
+    VIDEOCONVERTER2_THREAD_ID,
+)
+
+# ============================================================
+# Regex patterns
+# ============================================================
+# One header pattern for every subsystem. Each line is matched once and then
+# routed by thread_id, instead of every script re-scanning the whole log.
+# (P<rest>.*) is everything after the "-" separator: the Event message, or the
+# data block for the subsystem parsers.
+header_pattern = re.compile(
+    r'^(?P<datetime>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}),(?P<code>\d{3})'
+    r'\s+\[(?P<thread_id>\d+)\]\s+(?P<level>\w+)\s*-+\s*(?P<rest>.*)',
+)
+# Same header over raw log bytes (pc2.parse_buffer): everything but the
+# message is ASCII, so lines are matched before (or without) being decoded.
+header_bytes_pattern = re.compile(header_pattern.pattern.encode("ascii"))
+# Leading ':', '-' and whitespace between the message and the data block
+data_lead_pattern = re.compile(r'[:\s-]*')
+
+# Frontend: one block of 40 comma-separated values per band
+freq_pattern = re.compile(r'(\d+ghz)(.*?)(?=\d+ghz|$)', re.IGNORECASE)
+
+# Channel subsystems: the characters a key=value block's values may contain.
+# The key=value pattern itself is compiled from each subsystem's spec.
+CHANNEL_VALUES = r'[\+\-\d\.,a-zA-Z]*'
+# IF selector: numbers only, optional leading hyphen
+IF_SELECTOR_VALUES = r'-?\d*[\d.,-]*'
+
+EVENT_LEVELS = {"WARN", "DEBUG", "ERROR"}
+EVENT_LEVEL_PREFIXES = tuple(EVENT_LEVELS)
+EVENT_LEVEL_BYTES_PREFIXES = tuple(level.encode("ascii") for level in EVENT_LEVELS)
+
+# ============================================================
+# Timestamps
+# ============================================================
+# datetime + code (milliseconds) → one integer epoch-ms "ts" column. Consecutive
+# lines usually share the same second, so the last converted second is cached.
+_second_cache = {"datetime": None, "epoch_ms": 0}
+
+
+def epoch_ms(datetime_str, code):
+    if datetime_str != _second_cache["datetime"]:
+        # "YYYY-MM-DD HH:MM:SS" (the separator may be several spaces)
+        seconds = calendar.timegm((
+            int(datetime_str[0:4]), int(datetime_str[5:7]), int(datetime_str[8:10]),
+            int(datetime_str[-8:-6]), int(datetime_str[-5:-3]), int(datetime_str[-2:]),
+        ))
+        _second_cache["datetime"] = datetime_str
+        _second_cache["epoch_ms"] = (seconds - LOG_UTC_OFFSET_S) * 1000
+    return _second_cache["epoch_ms"] + int(code)
+
+# ============================================================
+# Value types
+# ============================================================
+# Numbers are stored as REAL/INTEGER and LOCK as 1 ('lck') / 0 ('lc').
+# Policy for malformed values: a value that cannot be converted (or is not
+# finite) is stored as NULL and counted in malformed_counts, which parse_lines
+# reports once per run. Missing channels are NULL as before.
+malformed_counts = Counter()
+
+
+def to_text(value):
+    return value
+
+
+def to_real(value):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def to_int(value):
+    number = to_real(value)
+    if number is None or not number.is_integer():
+        return None
+    return int(number)
+
+
+def to_lock(value):
+    if isinstance(value, (int, float)):
+        return int(value)
+    value = value.lower()
+    if "lck" in value:
+        return 1
+    if "lc" in value:
+        return 0
+    return None
+
+
+SQL_TYPES = {to_text: "TEXT", to_real: "REAL", to_int: "INTEGER", to_lock: "INTEGER"}
+
+
+def _convert(column, convert, value):
+    if value is None:
+        return None
+    converted = convert(value)
+    if converted is None:
+        malformed_counts[column] += 1
+    return converted
+
+# ============================================================
+# Column definitions
+# ============================================================
+HEADER_COLUMNS = ["ts", "thread_id", "level"]
+EVENT_COLUMNS = HEADER_COLUMNS + ["message"]
+
+FRONTEND_COLUMNS = [
+    "RF_RHCP",
+    "RF_LHCP",
+    "RF_Low",
+    "Cryo_ColdPla",
+    "Cryo_ShieldBox",
+    "Pressure",
+    "NormalTemp_RF",
+    "NormalTemp_Noise",
+    "NormalTemp_Load",
+    "LNA_LHCP_Vg1",
+    "LNA_LHCP_Vg2",
+    "LNA_LHCP_Vg3",
+    "LNA_LHCP_Vg4",
+    "LNA_LHCP_Vd1",
+    "LNA_LHCP_Vd2",
+    "LNA_LHCP_Vd3",
+    "LNA_LHCP_Vd4",
+    "LNA_LHCP_Id1",
+    "LNA_LHCP_Id2",
+    "LNA_LHCP_Id3",
+    "LNA_LHCP_Id4",
+    "NA_RHCP_Vg1",
+    "NA_RHCP_Vg2",
+    "NA_RHCP_Vg3",
+    "NA_RHCP_Vg4",
+    "LNA_RHCP_Vd1",
+    "LNA_RHCP_Vd2",
+    "LNA_RHCP_Vd3",
+    "LNA_RHCP_Vd4",
+    "LNA_RHCP_Id1",
+    "LNA_RHCP_Id2",
+    "LNA_RHCP_Id3",
+    "LNA_RHCP_Id4",
+    "Observation_Mode",
+    "PolarizationStatus",
+    "Status_NoiseDiode",
+    "Status_PLO",
+    "Status_PCAL",
+    "Status_CalChoppe",
+    "Status_FlatMirror"
+]
+FRONTEND_BANDS = ["2ghz", "8ghz", "22ghz", "43ghz"]
+# Temperatures, pressure, RF levels and LNA bias are numeric; the last 7 are status text
+FRONTEND_CONVERTERS = [to_real] * 33 + [to_text] * 7
+
+# Channel subsystems are declared once; everything else is derived from the spec:
+#   thread_id - PC1 thread writing the lines (only INFO lines are stored)
+#   keys      - (key in the data block, column suffix, converter), in column order
+#   labels    - channel labels; the columns are "<label><suffix>", key by key
+#   values    - characters the values of a key=value block may contain
+# A new receiver is one more entry here (plus its thread id in config).
+DOWNCONVERTER_KEYS = [
+    ("att", "ATT", to_real),
+    ("level", "LEVEL", to_real),
+    ("lock", "LOCK", to_lock),
+]
+CHANNEL_SPECS = {
+    # 12 data points (4 channels for each of the 3 keys)
+    "KDown": {
+        "thread_id": KDOWN_THREAD_ID,
+        "keys": DOWNCONVERTER_KEYS,
+        "labels": [f"K{i}" for i in range(1, 5)],
+        "values": CHANNEL_VALUES,
+    },
+    "QDown": {
+        "thread_id": QDOWN_THREAD_ID,
+        "keys": DOWNCONVERTER_KEYS,
+        "labels": [f"Q{i}" for i in range(1, 5)],
+        "values": CHANNEL_VALUES,
+    },
+    # 9 data points (3 channels → S, X1, X2 for each of the 3 keys)
+    "SXDown": {
+        "thread_id": SXDOWN_THREAD_ID,
+        "keys": DOWNCONVERTER_KEYS,
+        "labels": ["S", "X1", "X2"],
+        "values": CHANNEL_VALUES,
+    },
+    # 48 data points (16 channels for each of the 3 keys)
+    "IFselector": {
+        "thread_id": IF_SELECTOR_THREAD_ID,
+        "keys": [
+            ("att", "ATT", to_real),
+            ("out2in", "OUT2IN", to_int),
+            ("level", "LEVEL", to_real),
+        ],
+        "labels": [f"CH{i}" for i in range(1, 17)],
+        "values": IF_SELECTOR_VALUES,
+    },
+    # 40 data points (channels 9–16 for each of the 5 keys)
+    "VideoConverter2": {
+        "thread_id": VIDEOCONVERTER2_THREAD_ID,
+        "keys": [
+            ("att", "ATT", to_real),
+            ("frqall", "FRQ", to_real),
+            ("levell", "LEVELL", to_real),
+            ("levelu", "LEVELU", to_real),
+            ("lock", "LOCK", to_lock),
+        ],
+        "labels": [f"CH{i}" for i in range(9, 17)],
+        "values": CHANNEL_VALUES,
+    },
+}
+CHANNEL_LEVELS = {"INFO"}
+
+
+def channel_columns(spec):
+    return [f"{label}{suffix}" for _, suffix, _ in spec["keys"] for label in spec["labels"]]
+
+
+def channel_converters(spec):
+    return [convert for _, _, convert in spec["keys"] for _ in spec["labels"]]
+
+
+# Converter per column, aligned with TABLE_COLUMNS (SQL type via SQL_TYPES)
+HEADER_CONVERTERS = [to_int, to_int, to_text]
+
+TABLE_COLUMNS = {"Event": EVENT_COLUMNS}
+TABLE_CONVERTERS = {"Event": HEADER_CONVERTERS + [to_text]}
+for _name, _spec in CHANNEL_SPECS.items():
+    TABLE_COLUMNS[_name] = HEADER_COLUMNS + channel_columns(_spec)
+    TABLE_CONVERTERS[_name] = HEADER_CONVERTERS + channel_converters(_spec)
+for _band in FRONTEND_BANDS:
+    TABLE_COLUMNS[f"frontend_{_band}"] = HEADER_COLUMNS + FRONTEND_COLUMNS
+    TABLE_CONVERTERS[f"frontend_{_band}"] = HEADER_CONVERTERS + FRONTEND_CONVERTERS
+
+TABLE_TYPES = {
+    table_name: [SQL_TYPES[convert] for convert in converters]
+    for table_name, converters in TABLE_CONVERTERS.items()
+}
+
+
+# ============================================================
+# Per-subsystem row builders
+# ============================================================
+# Rows are lists in TABLE_COLUMNS order, ready for executemany; ts is always
+# the first value (TS_INDEX).
+TS_INDEX = 0
+
+
+def _header_row(e):
+    return [e["ts"], int(e["thread_id"]), e["level"]]
+
+
+def parse_frontend(e, tables):
+    for freq, values in freq_pattern.findall(e["data"]):
+        freq = freq.lower()
+        if freq not in FRONTEND_BANDS:
+            continue
+
+        # Split comma-separated values, padded/truncated to exactly 40
+        vals = [v.strip() for v in values.strip(" ,").split(",") if v.strip()]
+        if len(vals) < len(FRONTEND_COLUMNS):
+            vals += [None] * (len(FRONTEND_COLUMNS) - len(vals))
+        else:
+            vals = vals[:len(FRONTEND_COLUMNS)]
+
+        row = _header_row(e)
+        for col_name, convert, val in zip(FRONTEND_COLUMNS, FRONTEND_CONVERTERS, vals):
+            row.append(_convert(col_name, convert, val))
+        tables[f"frontend_{freq}"].append(row)
+
+
+def compile_channel_parser(table_name, spec):
+    # Spec → row builder. The key=value pattern, each key's position in the
+    # row, its converter and its column names are worked out once here, so
+    # the per-line work is one findall and the value conversions.
+    kv_pattern = re.compile(
+        rf'({"|".join(key for key, _, _ in spec["keys"])})=({spec["values"]})',
+        re.IGNORECASE
+    )
+    labels = spec["labels"]
+    width = len(labels)
+    header_width = len(HEADER_COLUMNS)
+    # (key, first row index, converter, column names)
+    slots = [
+        (key, header_width + i * width, convert, [f"{label}{suffix}" for label in labels])
+        for i, (key, suffix, convert) in enumerate(spec["keys"])
+    ]
+    row_width = header_width + len(slots) * width
+
+    def parse(e, tables):
+        # key → values; a repeated key keeps its last block
+        blocks = {key.lower(): values_str for key, values_str in kv_pattern.findall(e["data"])}
+        row = _header_row(e) + [None] * (row_width - header_width)
+        for key, start, convert, columns in slots:
+            values_str = blocks.get(key)
+            if not values_str:
+                continue
+            vals = [v.strip() for v in values_str.split(",") if v.strip()]
+            for idx, val in enumerate(vals[:width]):
+                row[start + idx] = _convert(columns[idx], convert, val)
+        tables[table_name].append(row)
+
+    return parse
+
+
+# ============================================================
+# Subsystem registry
+# ============================================================
+# thread_id: None means the subsystem is selected by level (Event).
+# levels: None accepts any level, otherwise only the listed ones.
+SUBSYSTEMS = {
+    "Frontend": {
+        "thread_id": FRONTEND_THREAD_ID,
+        "levels": None,
+        "tables": [f"frontend_{band}" for band in FRONTEND_BANDS],
+        "parse": parse_frontend,
+    },
+}
+for _name, _spec in CHANNEL_SPECS.items():
+    SUBSYSTEMS[_name] = {
+        "thread_id": _spec["thread_id"],
+        "levels": CHANNEL_LEVELS,
+        "tables": [_name],
+        "parse": compile_channel_parser(_name, _spec),
+    }
+SUBSYSTEMS["Event"] = {
+    "thread_id": None,
+    "levels": EVENT_LEVELS,
+    "tables": ["Event"],
+    "parse": None,
+}
+
+
+# ============================================================
+# Single-scan parser
+# ============================================================
+def _since_key(sub, checkpoints):
+    # Oldest checkpoint over the subsystem's tables; None if any table has none.
+    keys = []
+    for table_name in sub["tables"]:
+        if table_name not in checkpoints:
+            return None
+        keys.append(checkpoints[table_name][0])
+    return min(keys)
+
+
+def _routes(subsystems, checkpoints):
+    # → (empty tables, {thread_id: subsystem with its "since" key}, want_events, event_since)
+    tables = {}
+    routes = {}
+    for name in subsystems:
+        sub = dict(SUBSYSTEMS[name], since=_since_key(SUBSYSTEMS[name], checkpoints))
+        for table_name in sub["tables"]:
+            tables[table_name] = []
+        if sub["thread_id"] is not None:
+            routes[sub["thread_id"]] = sub
+    want_events = "Event" in subsystems
+    event_since = _since_key(SUBSYSTEMS["Event"], checkpoints)
+    return tables, routes, want_events, event_since
+
+
+def _report_malformed():
+    if malformed_counts:
+        print(f"⚠ {sum(malformed_counts.values())} malformed values stored as NULL: {dict(malformed_counts)}")
+
+
+def _decode(field, encoding):
+    # Most fields are pure ASCII; only the rest go through the CP949 codec.
+    if field.isascii():
+        return field.decode("ascii")
+    return field.decode(encoding, errors="replace")
+
+
+def _route_line(e, tables, routes, want_events, event_since, encoding=None):
+    # Shared by parse_lines and parse_buffer once a line's header matched:
+    # adds its Event row and hands its data block to the parser of its thread.
+    # e holds ts, thread_id, level and rest; with `encoding`, rest is still
+    # bytes and is only decoded for a line that is kept.
+    ts = e["ts"]
+    if want_events and e["level"].upper() in EVENT_LEVELS and (event_since is None or ts >= event_since):
+        if encoding is not None:
+            e["rest"] = _decode(e["rest"], encoding).rstrip()
+            encoding = None  # decoded now
+        row = _header_row(e)
+        row.append(e["rest"])
+        tables["Event"].append(row)
+
+    sub = routes.get(e["thread_id"])
+    if sub is None:
+        return
+    if sub["levels"] is not None and e["level"] not in sub["levels"]:
+        return
+    if sub["since"] is not None and ts < sub["since"]:
+        return
+
+    if encoding is not None:
+        e["rest"] = _decode(e["rest"], encoding).rstrip()
+    rest = e["rest"]
+    data = rest[data_lead_pattern.match(rest).end():].strip()
+    if not data:
+        return
+    e["data"] = data.replace("，", ",")  # Normalize full-width commas
+    sub["parse"](e, tables)
+
+
+def parse_lines(lines, subsystems=None, checkpoints=None):
+    # Scan every line once and route it to the parser for its thread_id.
+    # Returns {table_name: [row, ...]} for every table of the selected subsystems.
+    # With checkpoints ({table_name: (last_ts, rows_at_last)}), lines
+    # older than a subsystem's checkpoint are skipped before the data is parsed.
+    if subsystems is None:
+        subsystems = list(SUBSYSTEMS)
+    if checkpoints is None:
+        checkpoints = {}
+    malformed_counts.clear()
+    tables, routes, want_events, event_since = _routes(subsystems, checkpoints)
+
+    for line in lines:
+        # Cheap prefilter on the "[NN]" token before the capture-group regex:
+        # the first '[' of a valid line is always the thread bracket, so lines
+        # of unwanted threads (and non-event levels) never reach the regex.
+        start = line.find("[")
+        if start < 0:
+            continue
+        end = line.find("]", start)
+        if end < 0:
+            continue
+        if line[start + 1:end] not in routes and not (
+            want_events and line[end + 1:end + 64].lstrip().upper().startswith(EVENT_LEVEL_PREFIXES)
+        ):
+            continue
+
+        line = line.strip()
+        m = header_pattern.match(line)
+        if not m:
+            continue
+        e = m.groupdict()
+
+        e["ts"] = epoch_ms(e["datetime"], e["code"])
+        _route_line(e, tables, routes, want_events, event_since)
+
+    _report_malformed()
+    return tables
+
+
+def parse_buffer(buffer, subsystems=None, checkpoints=None, encoding=LOG_ENCODING):
+    # parse_lines over the raw log bytes, without decoding the whole log:
+    # the prefilter, header regex and timestamps work on bytes, and only the
+    # Event message and the data block of routed lines are turned into text.
+    # Same arguments (plus the log encoding) and result as parse_lines.
+    if subsystems is None:
+        subsystems = list(SUBSYSTEMS)
+    if checkpoints is None:
+        checkpoints = {}
+    malformed_counts.clear()
+    tables, text_routes, want_events, event_since = _routes(subsystems, checkpoints)
+    routes = {thread_id.encode("ascii"): sub for thread_id, sub in text_routes.items()}
+
+    for line in buffer.splitlines():
+        start = line.find(b"[")
+        if start < 0:
+            continue
+        end = line.find(b"]", start)
+        if end < 0:
+            continue
+        thread_id = bytes(line[start + 1:end])
+        if thread_id not in routes and not (
+            want_events and line[end + 1:end + 64].lstrip().upper().startswith(EVENT_LEVEL_BYTES_PREFIXES)
+        ):
+            continue
+
+        m = header_bytes_pattern.match(line.strip())
+        if not m:
+            continue
+        datetime_bytes, code, _, level, rest = m.groups()
+        e = {"ts": epoch_ms(bytes(datetime_bytes), code), "thread_id": thread_id,
+             "level": level.decode("ascii"), "rest": rest}
+        _route_line(e, tables, routes, want_events, event_since, encoding)
+
+    _report_malformed()
+    return tables
@@ -0,0 +1,210 @@
+import glob
+import os
+import pathlib
+import sqlite3
+import stat
+import time
+
+from .config import LOG_UTC_OFFSET_S, PARTITION_DIR
+from .parsers import TS_INDEX
+from .storage import CHECKPOINT_TABLE, _time_filter, connect, load_checkpoints
+
+# ============================================================
+# Per-day partition files
+# ============================================================
+# Instead of one growing DB, rows are written to one SQLite file per log date
+# (KST, like the log itself): <root>/VLBI.<YYYY-MM-DD>.db. Every partition has
+# the usual tables, checkpoints and indexes, so each day is ingested, rebuilt
+# or appended on its own with the normal storage functions.
+#
+# Finished days are sealed (seal_partitions): checkpointed out of WAL,
+# vacuumed and made read-only. A sealed file never changes again, so it can
+# be archived or backed up once; later runs skip writing to it.
+#
+# attach_range opens a connection that ATTACHes only the partitions covering
+# a time range and defines a TEMP VIEW per table that unions them, so the
+# usual SQL works unchanged:
+#
+#     conn = pc2.partitions.attach_range(t0, t1)
+#     conn.execute("SELECT ts, K1LEVEL FROM KDown WHERE ts BETWEEN ? AND ?", (t0, t1))
+PARTITION_PREFIX = "VLBI."
+PARTITION_SUFFIX = ".db"
+# Partitions attached to one connection (SQLite's default SQLITE_MAX_ATTACHED)
+ATTACH_LIMIT = 10
+
+
+def partition_date(ts):
+    # UTC epoch ms → log date "YYYY-MM-DD"
+    return time.strftime("%Y-%m-%d", time.gmtime((ts + LOG_UTC_OFFSET_S * 1000) // 1000))
+
+
+def partition_path(date, root=PARTITION_DIR):
+    return os.path.join(root, f"{PARTITION_PREFIX}{date}{PARTITION_SUFFIX}")
+
+
+def list_partitions(root=PARTITION_DIR):
+    # [(date, path)], oldest first
+    partitions = []
+    for path in glob.glob(os.path.join(root, f"{PARTITION_PREFIX}*{PARTITION_SUFFIX}")):
+        date = os.path.basename(path)[len(PARTITION_PREFIX):-len(PARTITION_SUFFIX)]
+        partitions.append((date, path))
+    return sorted(partitions)
+
+
+def is_sealed(path):
+    # Read-only file (checked on the mode bits: os.access is always True for root)
+    return os.path.exists(path) and not os.stat(path).st_mode & stat.S_IWUSR
+
+
+def split_by_date(tables):
+    # {table_name: rows} → {date: {table_name: rows}}, keeping row order
+    by_date = {}
+    for table_name, rows in tables.items():
+        for row in rows:
+            date = partition_date(row[TS_INDEX])
+            by_date.setdefault(date, {}).setdefault(table_name, []).append(row)
+    return dict(sorted(by_date.items()))
+
+
+def open_partitions(tables, root=PARTITION_DIR):
+    # Yields (date, conn, day_tables) for every date the rows cover, oldest
+    # first, with a connection to that date's partition (closed on the next
+    # step). Rows of sealed partitions are skipped with a warning.
+    for date, day_tables in split_by_date(tables).items():
+        path = partition_path(date, root)
+        if is_sealed(path):
+            skipped = sum(len(rows) for rows in day_tables.values())
+            print(f"⚠ Partition {date} is sealed; skipped {skipped} rows")
+            continue
+        conn = connect(path)
+        try:
+            yield date, conn, day_tables
+        finally:
+            conn.close()
+
+
+def _ro_uri(path):
+    return pathlib.Path(path).resolve().as_uri() + "?mode=ro"
+
+
+def load_partition_checkpoints(root=PARTITION_DIR, stored_in=None):
+    # {table_name: (last_ts, rows_at_last)} from the newest partition holding
+    # each table, for skipping already-stored lines while parsing. Partitions
+    # are opened read-only, so sealed ones can be read too. stored_in: as in
+    # load_checkpoints.
+    checkpoints = {}
+    for _, path in reversed(list_partitions(root)):
+        conn = sqlite3.connect(_ro_uri(path), uri=True)
+        try:
+            if not conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (CHECKPOINT_TABLE,)
+            ).fetchone():
+                continue
+            for table_name, checkpoint in load_checkpoints(conn, stored_in).items():
+                checkpoints.setdefault(table_name, checkpoint)
+        finally:
+            conn.close()
+    return checkpoints
+
+
+def seal_partitions(before, root=PARTITION_DIR):
+    # Seal every partition older than the date `before` ("YYYY-MM-DD"):
+    # fold the WAL into the file, switch to a rollback journal (a read-only
+    # WAL database cannot be opened without its -shm file), vacuum, and
+    # make the file read-only. → dates sealed
+    sealed = []
+    for date, path in list_partitions(root):
+        if date >= before or is_sealed(path):
+            continue
+        conn = sqlite3.connect(path)
+        try:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.execute("PRAGMA journal_mode=DELETE")
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        os.chmod(path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        sealed.append(date)
+        print(f"🔒 Sealed partition {date}")
+    return sealed
+
+
+def _covering(t0, t1, root):
+    first = partition_date(t0) if t0 is not None else ""
+    last = partition_date(t1) if t1 is not None else "9999"
+    return [(date, path) for date, path in list_partitions(root) if first <= date <= last]
+
+
+def _create_union_views(conn, schemas):
+    # One TEMP VIEW per table/view name over every attached partition that
+    # has it. Columns follow the newest partition; a column missing from an
+    # older partition (written before a schema change) reads as NULL.
+    names = {}
+    for schema in schemas:
+        for (name,) in conn.execute(
+            f"SELECT name FROM {schema}.sqlite_master WHERE type IN ('table', 'view') AND name NOT LIKE 'sqlite_%'"
+        ):
+            names.setdefault(name, []).append(schema)
+
+    for name, in_schemas in names.items():
+        columns = {
+            schema: [r[1] for r in conn.execute(f"PRAGMA {schema}.table_info({name})")]
+            for schema in in_schemas
+        }
+        view_columns = columns[in_schemas[-1]]
+        selects = [
+            "SELECT " + ", ".join(col if col in columns[schema] else f"NULL AS {col}" for col in view_columns)
+            + f" FROM {schema}.{name}"
+            for schema in in_schemas
+        ]
+        conn.execute(f"CREATE TEMP VIEW {name} AS " + " UNION ALL ".join(selects))
+
+
+def _attach(partitions):
+    # In-memory connection with `partitions` attached read-only as p0, p1, ...
+    # (oldest first) and the union views over them
+    conn = sqlite3.connect(":memory:", uri=True)
+    try:
+        schemas = []
+        for i, (_, path) in enumerate(partitions):
+            conn.execute(f"ATTACH DATABASE ? AS p{i}", (_ro_uri(path),))
+            schemas.append(f"p{i}")
+        _create_union_views(conn, schemas)
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+def attach_range(t0=None, t1=None, root=PARTITION_DIR):
+    # Connection over the partitions covering [t0, t1]. The views span whole
+    # days; filter on ts for the exact range.
+    partitions = _covering(t0, t1, root)
+    if len(partitions) > ATTACH_LIMIT:
+        raise ValueError(
+            f"{len(partitions)} partitions cover the range but only {ATTACH_LIMIT} can be attached; "
+            "query a shorter range or use read_range"
+        )
+    return _attach(partitions)
+
+
+def read_range(table_name, t0=None, t1=None, columns=None, root=PARTITION_DIR):
+    # Rows (`columns`, default all) of one table with t0 <= ts <= t1, ordered
+    # by ts, across any number of partitions: they are attached ATTACH_LIMIT
+    # at a time, and the batches follow each other in time.
+    where, params = _time_filter(t0, t1)
+    sql = f"SELECT {', '.join(columns) if columns else '*'} FROM {table_name}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY ts"
+
+    partitions = _covering(t0, t1, root)
+    rows = []
+    for start in range(0, len(partitions), ATTACH_LIMIT):
+        conn = _attach(partitions[start:start + ATTACH_LIMIT])
+        try:
+            if conn.execute("SELECT 1 FROM sqlite_temp_master WHERE name = ?", (table_name,)).fetchone():
+                rows.extend(conn.execute(sql, params).fetchall())
+        finally:
+            conn.close()
+    return rows
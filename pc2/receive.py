@@ -0,0 +1,235 @@
+import codecs
+import socket
+import time
+
+from .config import (
+    PC1_IP,
+    PC1_PORT,
+    RECV_SIZE,
+    LOG_ENCODING,
+    TRANSFER_NEGOTIATION,
+    ACCEPT_ENCODINGS,
+    TRANSFER_RETRIES,
+    TRANSFER_RECONNECT_S,
+    TRANSFER_MAX_BACKOFF_S,
+)
+from .transfer import available_encodings, decompress_chunks, hello
+
+
+# ============================================================
+# Receive the log file from PC1
+# ============================================================
+# PC1 sends the whole log and closes the connection. Reads go into one
+# preallocated buffer with recv_into, so receiving is linear in the log size
+# instead of re-copying the accumulated bytes on every chunk. With
+# TRANSFER_NEGOTIATION, the transfer is decompressed on the fly and an
+# interrupted transfer is resumed where it stopped (see pc2.transfer).
+def _connect(ip, port):
+    print("Connecting to PC1...")
+    client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    client.connect((ip, port))
+    return client
+
+
+def iter_chunks(client, recv_size=RECV_SIZE):
+    # Yields memoryviews into a reused buffer: consume each one before the next.
+    buf = bytearray(recv_size)
+    view = memoryview(buf)
+    while True:
+        n = client.recv_into(view)
+        if not n:
+            break
+        yield view[:n]
+
+
+def _split_complete(text):
+    # (complete lines, trailing partial line)
+    lines = text.splitlines(True)
+    if lines and lines[-1] == lines[-1].rstrip("\r\n"):
+        return lines, lines.pop()
+    return lines, ""
+
+
+def decode_lines(chunks, encoding=LOG_ENCODING):
+    # Incrementally decode byte chunks and yield complete lines as they arrive.
+    # Only the trailing partial line is held between chunks.
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    pending = ""
+    for chunk in chunks:
+        lines, pending = _split_complete(pending + decoder.decode(chunk))
+        yield from lines
+    text = pending + decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+def _log_chunks(ip, port, recv_size, negotiate, accept, retries, stats):
+    # Connect, negotiate the transfer and yield the (decompressed) log.
+    # When the sender announced the log length and the connection ends (or
+    # fails) before it, reconnect with exponential backoff and ask for the
+    # rest: the caller just sees one uninterrupted stream of bytes.
+    accept = [enc for enc in accept if enc in available_encodings()]
+    stats.update(encoding="identity", received=0, connections=0)
+    offset = 0
+    length = None
+    failures = 0
+    delay = TRANSFER_RECONNECT_S
+    while True:
+        start = offset
+        conn_stats = {}
+        try:
+            client = _connect(ip, port)
+            stats["connections"] += 1
+            try:
+                if negotiate:
+                    client.sendall(hello(accept, offset))
+                skip = None
+                for chunk in decompress_chunks(iter_chunks(client, recv_size), conn_stats):
+                    if skip is None:
+                        # A sender that starts before the requested offset
+                        # (e.g. one without range support): drop the overlap
+                        skip = start - (conn_stats["offset"] or 0)
+                        if skip < 0:
+                            # Bytes are missing: not a network failure, so
+                            # not retried (a ValueError passes the OSError
+                            # handler below)
+                            raise ValueError(f"PC1 resumed at {conn_stats['offset']}, after {start}")
+                    if skip:
+                        cut = min(skip, len(chunk))
+                        chunk, skip = chunk[cut:], skip - cut
+                    offset += len(chunk)
+                    yield chunk
+            finally:
+                client.close()
+                stats["received"] += conn_stats.get("received", 0)
+            error = None
+        except OSError as exc:
+            error = exc
+
+        if conn_stats.get("length") is not None:
+            length = conn_stats["length"]
+            stats["encoding"] = conn_stats["encoding"]
+        if length is None:
+            # Plain sender (or no answer at all): nothing to resume from
+            if error is not None:
+                raise error
+            return
+        if offset >= length:
+            return
+
+        failures = 0 if offset > start else failures + 1
+        if failures > retries:
+            raise ConnectionError(f"Incomplete transfer from PC1: {offset} of {length} bytes") from error
+        if offset > start:
+            delay = TRANSFER_RECONNECT_S
+        print(f"⚠ Transfer interrupted at {offset} of {length} bytes ({error or 'connection closed'}); "
+              f"resuming in {delay:.1f}s")
+        time.sleep(delay)
+        delay = min(delay * 2, TRANSFER_MAX_BACKOFF_S)
+
+
+def _report(stats, size):
+    message = f"✅ Received {stats['received']} bytes from PC1"
+    if stats["encoding"] != "identity":
+        ratio = size / stats["received"] if stats["received"] else 0
+        message += f" ({stats['encoding']}, {size} bytes decompressed, x{ratio:.1f})"
+    if stats["connections"] > 1:
+        message += f" over {stats['connections']} connections"
+    print(message)
+
+
+def receive_lines(ip=PC1_IP, port=PC1_PORT, recv_size=RECV_SIZE, negotiate=TRANSFER_NEGOTIATION,
+                  accept=ACCEPT_ENCODINGS, retries=TRANSFER_RETRIES):
+    # Stream decoded lines from PC1 without keeping the raw log in memory.
+    # A compressed transfer is decompressed chunk by chunk; after a resumed
+    # transfer the decoding simply continues, so no line is parsed twice.
+    stats = {}
+    size = 0
+
+    def counted_chunks():
+        nonlocal size
+        for chunk in _log_chunks(ip, port, recv_size, negotiate, accept, retries, stats):
+            size += len(chunk)
+            yield chunk
+
+    yield from decode_lines(counted_chunks())
+    _report(stats, size)
+
+
+def receive_log(ip=PC1_IP, port=PC1_PORT, recv_size=RECV_SIZE, negotiate=TRANSFER_NEGOTIATION,
+                accept=ACCEPT_ENCODINGS, retries=TRANSFER_RETRIES):
+    # Whole raw (decompressed) log as one bytearray (amortized linear growth).
+    stats = {}
+    buffer = bytearray()
+    for chunk in _log_chunks(ip, port, recv_size, negotiate, accept, retries, stats):
+        buffer += chunk
+    _report(stats, len(buffer))
+    return buffer
+
+
+def decode_log(buffer, encoding=LOG_ENCODING):
+    # errors="replace" never raises, so no EUC-KR fallback is needed.
+    return buffer.decode(encoding, errors="replace").splitlines()
+
+
+def follow_lines(ip=PC1_IP, port=PC1_PORT, tick=0.25, recv_size=RECV_SIZE, encoding=LOG_ENCODING,
+                 negotiate=TRANSFER_NEGOTIATION, accept=ACCEPT_ENCODINGS, position=None):
+    # Like receive_lines, but for a connection that stays open: yields None
+    # whenever no data arrived for `tick` seconds so the caller can flush.
+    # `position` (a dict kept by the caller across connections) holds
+    # "offset", the log bytes of complete lines consumed so far. With
+    # `negotiate`, the hello asks PC1 to start there, so a reconnect only
+    # transfers what is new and a trailing partial line is left for the next
+    # connection. Without it, PC1 sends the whole log on every connection.
+    if position is None:
+        position = {}
+    requested = position.setdefault("offset", 0) if negotiate else 0
+    accept = [enc for enc in accept if enc in available_encodings()]
+    client = _connect(ip, port)
+    client.settimeout(tick)
+    buf = bytearray(recv_size)
+    view = memoryview(buf)
+
+    def chunks():
+        # Received bytes; b"" after `tick` seconds without data
+        while True:
+            try:
+                n = client.recv_into(view)
+            except socket.timeout:
+                yield b""
+                continue
+            if not n:
+                return
+            yield bytes(view[:n])
+
+    conn_stats = {}
+    pending = b""
+    skip = None
+    try:
+        if negotiate:
+            client.sendall(hello(accept, requested))
+        for chunk in decompress_chunks(chunks(), conn_stats):
+            if not chunk:
+                yield None
+                continue
+            if skip is None:
+                # A sender that starts before the requested offset (or sends
+                # the plain log from the start): drop the overlap
+                skip = requested - (conn_stats["offset"] or 0)
+                if skip < 0:
+                    raise ValueError(f"PC1 resumed at {conn_stats['offset']}, after {requested}")
+                position["offset"] = requested
+            if skip:
+                cut = min(skip, len(chunk))
+                chunk, skip = chunk[cut:], skip - cut
+            # Lines are cut on b"\n" (safe for CP949) and decoded whole
+            data = pending + chunk
+            end = data.rfind(b"\n") + 1
+            pending = data[end:]
+            if end:
+                position["offset"] += end
+                yield from data[:end].decode(encoding, errors="replace").splitlines(True)
+        if pending and not negotiate:
+            yield pending.decode(encoding, errors="replace")
+    finally:
+        client.close()
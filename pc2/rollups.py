@@ -0,0 +1,186 @@
+from .parsers import TABLE_COLUMNS, TABLE_CONVERTERS, to_real, to_int, to_lock
+from .storage import _table_schema, _time_filter
+
+# ============================================================
+# Per-minute / per-hour rollups
+# ============================================================
+# For every stored table with numeric columns, "<table>_rollup_1m" and
+# "<table>_rollup_1h" hold one row per minute/hour (bucket_ts = start of the
+# bucket, UTC epoch ms) with the number of samples and, per column:
+#   numeric (REAL/INTEGER) - <col>_min, <col>_max, <col>_mean, <col>_count
+#   LOCK                   - <col>_count and <col>_losses (samples with lock 0)
+# _count only counts non-NULL values, so the mean ignores malformed values.
+#
+# update_rollups folds the rows added since its last run into the buckets
+# (an upsert per bucket, merging min/max/mean/count), so it is cheap to call
+# after every append; dashboards then read thousands of rollup rows instead
+# of millions of samples. The position is remembered per table as the last
+# rolled-up rowid and its ts; if that row is gone or changed (the table was
+# rebuilt by write_tables), the table's rollups are rebuilt from scratch.
+ROLLUP_CHECKPOINT_TABLE = "rollup_checkpoint"
+ROLLUP_BUCKETS = {"1m": 60_000, "1h": 3_600_000}
+
+
+def rollup_table(table_name, resolution):
+    return f"{table_name}_rollup_{resolution}"
+
+
+def _rollup_columns(table_name):
+    # [(source column, kind)], kind "value" or "lock"
+    columns = []
+    for col, convert in zip(TABLE_COLUMNS[table_name], TABLE_CONVERTERS[table_name]):
+        if col in ("ts", "thread_id"):
+            continue
+        if convert in (to_real, to_int):
+            columns.append((col, "value"))
+        elif convert is to_lock:
+            columns.append((col, "lock"))
+    return columns
+
+
+def _rollup_schema(table_name):
+    # [(column, SQL type)] of the rollup tables
+    schema = [("bucket_ts", "INTEGER"), ("samples", "INTEGER")]
+    for col, kind in _rollup_columns(table_name):
+        if kind == "value":
+            schema += [(f"{col}_min", "REAL"), (f"{col}_max", "REAL"), (f"{col}_mean", "REAL"),
+                       (f"{col}_count", "INTEGER")]
+        else:
+            schema += [(f"{col}_count", "INTEGER"), (f"{col}_losses", "INTEGER")]
+    return schema
+
+
+def _create_rollup_table(conn, table_name, resolution):
+    cols_sql = ",\n    ".join(
+        f"{col} {sql_type}" + (" PRIMARY KEY" if col == "bucket_ts" else "")
+        for col, sql_type in _rollup_schema(table_name)
+    )
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {rollup_table(table_name, resolution)} (\n    {cols_sql}\n);")
+
+
+def _upsert_sql(table_name, resolution):
+    # INSERT ... SELECT aggregating the new rows per bucket, merged into
+    # existing buckets. In SET, bare names are the stored (old) values.
+    bucket_ms = ROLLUP_BUCKETS[resolution]
+    select = [f"(ts / {bucket_ms}) * {bucket_ms}", "COUNT(*)"]
+    updates = ["samples = samples + excluded.samples"]
+    for col, kind in _rollup_columns(table_name):
+        if kind == "value":
+            select += [f"MIN({col})", f"MAX({col})", f"AVG({col})", f"COUNT({col})"]
+            updates += [
+                f"{col}_min = coalesce(min({col}_min, excluded.{col}_min), {col}_min, excluded.{col}_min)",
+                f"{col}_max = coalesce(max({col}_max, excluded.{col}_max), {col}_max, excluded.{col}_max)",
+                f"{col}_mean = CASE WHEN {col}_count + excluded.{col}_count > 0 THEN "
+                f"(coalesce({col}_mean, 0) * {col}_count + coalesce(excluded.{col}_mean, 0) * excluded.{col}_count)"
+                f" / ({col}_count + excluded.{col}_count) END",
+                f"{col}_count = {col}_count + excluded.{col}_count",
+            ]
+        else:
+            select += [f"COUNT({col})", f"COALESCE(SUM({col} = 0), 0)"]
+            updates += [
+                f"{col}_count = {col}_count + excluded.{col}_count",
+                f"{col}_losses = {col}_losses + excluded.{col}_losses",
+            ]
+    return (
+        f"INSERT INTO {rollup_table(table_name, resolution)} "
+        f"SELECT {', '.join(select)} FROM {table_name} WHERE rowid > ? AND rowid <= ? GROUP BY 1 "
+        f"ON CONFLICT(bucket_ts) DO UPDATE SET {', '.join(updates)}"
+    )
+
+
+def _create_rollup_checkpoint_table(conn):
+    conn.execute(f"""
+    CREATE TABLE IF NOT EXISTS {ROLLUP_CHECKPOINT_TABLE} (
+        table_name TEXT PRIMARY KEY,
+        last_rowid INTEGER,
+        last_ts INTEGER
+    );
+    """)
+
+
+def _rollup_start(conn, table_name):
+    # rowid after which rows still have to be rolled up; resets the rollup
+    # tables when the stored position no longer matches the table.
+    row = conn.execute(
+        f"SELECT last_rowid, last_ts FROM {ROLLUP_CHECKPOINT_TABLE} WHERE table_name = ?", (table_name,)
+    ).fetchone()
+    up_to_date = all(
+        _table_schema(conn, rollup_table(table_name, resolution)) == _rollup_schema(table_name)
+        for resolution in ROLLUP_BUCKETS
+    )
+    if row is not None and up_to_date:
+        last_rowid, last_ts = row
+        if last_rowid == 0:
+            return 0
+        stored = conn.execute(f"SELECT ts FROM {table_name} WHERE rowid = ?", (last_rowid,)).fetchone()
+        if stored is not None and stored[0] == last_ts:
+            return last_rowid
+
+    for resolution in ROLLUP_BUCKETS:
+        conn.execute(f"DROP TABLE IF EXISTS {rollup_table(table_name, resolution)}")
+        _create_rollup_table(conn, table_name, resolution)
+    return 0
+
+
+def _rollup_tables(conn):
+    # Stored tables with something to roll up
+    names = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    return [name for name in TABLE_COLUMNS if name in names and _rollup_columns(name)]
+
+
+def update_rollups(conn, table_names=None, verbose=True):
+    # Fold rows added since the last call into the rollups of `table_names`
+    # (default: every stored table with numeric columns), in one transaction.
+    # → {table_name: rows rolled up}
+    if table_names is None:
+        table_names = _rollup_tables(conn)
+    _create_rollup_checkpoint_table(conn)
+    conn.commit()
+
+    rolled = {}
+    conn.execute("BEGIN")
+    try:
+        for table_name in table_names:
+            if not _rollup_columns(table_name) or not _table_schema(conn, table_name):
+                continue
+            start = _rollup_start(conn, table_name)
+            end_row = conn.execute(f"SELECT rowid, ts FROM {table_name} ORDER BY rowid DESC LIMIT 1").fetchone()
+            if end_row is None or end_row[0] <= start:
+                rolled[table_name] = 0
+                continue
+            end, end_ts = end_row
+            for resolution in ROLLUP_BUCKETS:
+                conn.execute(_upsert_sql(table_name, resolution), (start, end))
+            # Rowids have gaps after deletes, so the rows are counted
+            (count,) = conn.execute(
+                f"SELECT COUNT(*) FROM {table_name} WHERE rowid > ? AND rowid <= ?", (start, end)
+            ).fetchone()
+            conn.execute(
+                f"INSERT OR REPLACE INTO {ROLLUP_CHECKPOINT_TABLE} VALUES (?, ?, ?)", (table_name, end, end_ts)
+            )
+            rolled[table_name] = count
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    if verbose:
+        for table_name, count in rolled.items():
+            if count:
+                print(f"✅ Rolled up {count} rows of {table_name}")
+    return rolled
+
+
+def read_rollup(conn, table_name, column, t0=None, t1=None, resolution="1m"):
+    # [(bucket_ts, min, max, mean, count)] of one numeric column, or
+    # [(bucket_ts, count, losses)] of a LOCK column, for buckets in [t0, t1]
+    kinds = dict(_rollup_columns(table_name))
+    if kinds[column] == "value":
+        fields = f"bucket_ts, {column}_min, {column}_max, {column}_mean, {column}_count"
+    else:
+        fields = f"bucket_ts, {column}_count, {column}_losses"
+    where, params = _time_filter(t0, t1, t0_column="bucket_ts", t1_column="bucket_ts")
+    sql = f"SELECT {fields} FROM {rollup_table(table_name, resolution)}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return conn.execute(sql + " ORDER BY bucket_ts", params).fetchall()
@@ -0,0 +1,199 @@
+from .parsers import TABLE_COLUMNS, TABLE_TYPES, TS_INDEX
+from .storage import CHECKPOINT_TABLE, _create_checkpoint_table, _rows_after, _save_checkpoint, _time_filter
+
+# ============================================================
+# Change-only (run-length) storage
+# ============================================================
+# Monitor values (ATT, FRQALL, OUT2IN, LOCK, ...) repeat line after line.
+# In this mode a table is stored as "<table>_runs": one row per run of
+# identical samples, with the first and last sample time and the number of
+# samples in between, instead of one row per sample:
+#
+#     start_ts, end_ts, samples, thread_id, level, <value columns...>
+#
+# A new run starts whenever any value (or thread/level) changes. The view
+# "<table>_expanded" (and expand_runs, which only reads the runs of a time
+# window) turns the runs back into per-sample rows with the original
+# columns; sample times inside a run are spread evenly between start_ts and
+# end_ts, so they are exact at every change and approximate in between.
+# The checkpoint is saved under "<table>_runs" only, so the per-sample table
+# (still written by the single-subsystem scripts) keeps its own; load it for
+# parsing and the Parquet export with stored_in=runs_stored_in(...).
+RUNS_SUFFIX = "_runs"
+EXPANDED_SUFFIX = "_expanded"
+RUN_COLUMNS = ["start_ts", "end_ts", "samples"]
+
+
+def runs_table(table_name):
+    return f"{table_name}{RUNS_SUFFIX}"
+
+
+def runs_stored_in(table_names):
+    # Source table → its runs table and checkpoint (see load_checkpoints)
+    return {table_name: runs_table(table_name) for table_name in table_names}
+
+
+def to_runs(rows):
+    # Per-sample rows (TABLE_COLUMNS order, sorted by ts) → run rows
+    runs = []
+    last = None
+    for row in rows:
+        key = row[TS_INDEX + 1:]
+        if last is not None and key == last[len(RUN_COLUMNS):]:
+            last[1] = row[TS_INDEX]
+            last[2] += 1
+            continue
+        last = [row[TS_INDEX], row[TS_INDEX], 1] + list(key)
+        runs.append(last)
+    return runs
+
+
+def create_runs_table(conn, table_name):
+    # Same value columns as the per-sample table, with the run interval in
+    # place of ts, plus the expanding view.
+    name = runs_table(table_name)
+    value_cols = [
+        f"{col} {sql_type}"
+        for col, sql_type in zip(TABLE_COLUMNS[table_name][1:], TABLE_TYPES[table_name][1:])
+    ]
+    cols_sql = ",\n    ".join(["start_ts INTEGER", "end_ts INTEGER", "samples INTEGER"] + value_cols)
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {name} (\n    {cols_sql}\n);")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_start_ts ON {name} (start_ts)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_end_ts ON {name} (end_ts)")
+
+    value_names = ", ".join(f"r.{col}" for col in TABLE_COLUMNS[table_name][1:])
+    conn.execute(f"""
+    CREATE VIEW IF NOT EXISTS {table_name}{EXPANDED_SUFFIX} AS
+    WITH RECURSIVE sample(run, i) AS (
+        SELECT rowid, 0 FROM {name}
+        UNION ALL
+        SELECT sample.run, sample.i + 1 FROM sample JOIN {name} r ON r.rowid = sample.run
+        WHERE sample.i + 1 < r.samples
+    )
+    SELECT r.start_ts + CASE WHEN r.samples > 1
+                             THEN (r.end_ts - r.start_ts) * sample.i / (r.samples - 1)
+                             ELSE 0 END AS ts,
+           {value_names}
+    FROM sample JOIN {name} r ON r.rowid = sample.run;
+    """)
+
+
+def _insert_runs(conn, table_name, runs):
+    placeholders = ", ".join("?" for _ in range(len(RUN_COLUMNS) + len(TABLE_COLUMNS[table_name]) - 1))
+    conn.executemany(f"INSERT INTO {runs_table(table_name)} VALUES ({placeholders})", runs)
+
+
+def _last_run(conn, table_name):
+    # (rowid, run row) of the newest run, or None
+    row = conn.execute(
+        f"SELECT rowid, * FROM {runs_table(table_name)} ORDER BY end_ts DESC, rowid DESC LIMIT 1"
+    ).fetchone()
+    if row is None:
+        return None
+    return row[0], list(row[1:])
+
+
+def _runs_checkpoint_from_table(conn, table_name):
+    # Runs table without a checkpoint: resume after its newest sample.
+    last = _last_run(conn, table_name)
+    if last is None:
+        return None
+    _, run = last
+    # Samples at exactly end_ts are not known individually; count the last one.
+    return (run[1], 1)
+
+
+def write_runs(conn, tables):
+    # Counterpart of write_tables: drop and rebuild each "<table>_runs". A
+    # table without rows (e.g. no VideoConverter2 lines in this log) keeps its
+    # runs and checkpoints.
+    _create_checkpoint_table(conn)
+    conn.commit()
+
+    written = {}
+    conn.execute("BEGIN")
+    try:
+        for table_name, rows in tables.items():
+            if not rows:
+                continue
+            name = runs_table(table_name)
+            conn.execute(f"DROP VIEW IF EXISTS {table_name}{EXPANDED_SUFFIX}")
+            conn.execute(f"DROP TABLE IF EXISTS {name}")
+            create_runs_table(conn, table_name)
+            conn.execute(f"DELETE FROM {CHECKPOINT_TABLE} WHERE table_name = ?", (name,))
+            runs = to_runs(rows)
+            _insert_runs(conn, table_name, runs)
+            _save_checkpoint(conn, name, rows, None)
+            written[table_name] = (len(rows), len(runs))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    for table_name in tables:
+        if table_name in written:
+            samples, runs = written[table_name]
+            print(f"✅ Stored {samples} samples of {table_name} as {runs} runs")
+        else:
+            print(f"⚠ Skipping {table_name}: No data found.")
+    return written
+
+
+def append_runs(conn, tables, checkpoints, verbose=True):
+    # Counterpart of append_tables. Samples after the "<table>_runs"
+    # checkpoint are turned into runs; when the first one continues the last
+    # stored run, that run is extended instead of starting a new one.
+    _create_checkpoint_table(conn)
+    conn.commit()
+
+    appended = {}
+    conn.execute("BEGIN")
+    try:
+        for table_name, rows in tables.items():
+            name = runs_table(table_name)
+            create_runs_table(conn, table_name)
+            checkpoint = checkpoints.get(name)
+            if checkpoint is None:
+                checkpoint = _runs_checkpoint_from_table(conn, table_name)
+
+            new_rows = _rows_after(rows, checkpoint)
+            runs = to_runs(new_rows)
+            last = _last_run(conn, table_name) if runs else None
+            if last is not None and last[1][len(RUN_COLUMNS):] == runs[0][len(RUN_COLUMNS):]:
+                rowid, _ = last
+                conn.execute(
+                    f"UPDATE {name} SET end_ts = ?, samples = samples + ? WHERE rowid = ?",
+                    (runs[0][1], runs[0][2], rowid),
+                )
+                runs = runs[1:]
+            _insert_runs(conn, table_name, runs)
+            _save_checkpoint(conn, name, new_rows, checkpoint)
+            appended[table_name] = (len(new_rows), len(runs))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    if verbose:
+        for table_name, (samples, runs) in appended.items():
+            print(f"✅ Appended {samples} samples of {table_name} ({runs} new runs)")
+    return appended
+
+
+def expand_runs(conn, table_name, t0=None, t1=None):
+    # Per-sample rows (TABLE_COLUMNS order) with t0 <= ts <= t1, expanded
+    # from the runs overlapping that window only (uses the start/end indexes).
+    # Runs overlapping the window: ending at or after t0, starting by t1
+    where, params = _time_filter(t0, t1, t0_column="end_ts", t1_column="start_ts")
+    sql = f"SELECT * FROM {runs_table(table_name)}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY start_ts"
+
+    rows = []
+    for start, end, samples, *values in conn.execute(sql, params):
+        for i in range(samples):
+            ts = start + (end - start) * i // (samples - 1) if samples > 1 else start
+            if (t0 is None or ts >= t0) and (t1 is None or ts <= t1):
+                rows.append([ts] + values)
+    return rows
@@ -0,0 +1,130 @@
+import sqlite3
+
+from .storage import EVENT_FTS_TABLE, _time_filter
+
+# ============================================================
+# Full-text search over Event messages
+# ============================================================
+# "Event_fts" is an FTS5 index over Event.message. It is an external-content
+# table: it stores only the index and reads the messages from Event itself.
+# The trigram tokenizer indexes every 3-character sequence, so any substring
+# of 3+ characters is found, including Korean text. Korean words carry their
+# particles attached, so a word-based tokenizer such as unicode61 would miss
+# most partial matches.
+#
+# Triggers on Event keep the index in sync row by row, so every later append
+# (Ingest, Event, Follow, Backfill scripts) is indexed with it. write_tables
+# and schema migrations recreate Event and drop the index with it;
+# create_event_index builds it again in one pass. Until then (or whenever a
+# trigger is missing) search_events scans with LIKE.
+#
+#     pc2.search.create_event_index(conn)
+#     pc2.search.search_events(conn, "통신 오류", t0=..., levels=["ERROR"])
+# "trigram" needs SQLite 3.34+ (older builds, common with Windows Python, skip
+# the index with a warning); "unicode61" matches whole words only
+EVENT_FTS_TOKENIZER = "trigram"
+# Shortest query the trigram index can answer; shorter ones scan with LIKE
+TRIGRAM_MIN_LENGTH = 3
+
+_TRIGGERS = {
+    f"{EVENT_FTS_TABLE}_ai": f"""
+        AFTER INSERT ON Event BEGIN
+            INSERT INTO {EVENT_FTS_TABLE} (rowid, message) VALUES (new.rowid, new.message);
+        END""",
+    f"{EVENT_FTS_TABLE}_ad": f"""
+        AFTER DELETE ON Event BEGIN
+            INSERT INTO {EVENT_FTS_TABLE} ({EVENT_FTS_TABLE}, rowid, message)
+            VALUES ('delete', old.rowid, old.message);
+        END""",
+    f"{EVENT_FTS_TABLE}_au": f"""
+        AFTER UPDATE OF message ON Event BEGIN
+            INSERT INTO {EVENT_FTS_TABLE} ({EVENT_FTS_TABLE}, rowid, message)
+            VALUES ('delete', old.rowid, old.message);
+            INSERT INTO {EVENT_FTS_TABLE} (rowid, message) VALUES (new.rowid, new.message);
+        END""",
+}
+
+
+def _sql(conn, type_, name):
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type = ? AND name = ?", (type_, name)).fetchone()
+    return row[0] if row else None
+
+
+def _fts_supported(conn, tokenizer):
+    # Whether this SQLite build has FTS5 and the tokenizer, tried on a
+    # throwaway TEMP table
+    try:
+        conn.execute(
+            f"CREATE VIRTUAL TABLE temp.{EVENT_FTS_TABLE}_probe USING fts5(message, tokenize='{tokenizer}')"
+        )
+    except sqlite3.OperationalError:
+        return False
+    conn.execute(f"DROP TABLE temp.{EVENT_FTS_TABLE}_probe")
+    return True
+
+
+def create_event_index(conn, tokenizer=EVENT_FTS_TOKENIZER):
+    # Create the index and its triggers, or repair them after Event was
+    # recreated (or the tokenizer changed). → True if the index was rebuilt
+    if _sql(conn, "table", "Event") is None:
+        return False
+    if not _fts_supported(conn, tokenizer):
+        print(f"⚠ Skipping the Event search index: SQLite {sqlite3.sqlite_version} has no FTS5 "
+              f"'{tokenizer}' tokenizer; search_events scans with LIKE.")
+        return False
+    conn.commit()
+
+    conn.execute("BEGIN")
+    try:
+        fts_sql = _sql(conn, "table", EVENT_FTS_TABLE)
+        if fts_sql is not None and f"tokenize='{tokenizer}'" not in fts_sql:
+            conn.execute(f"DROP TABLE {EVENT_FTS_TABLE}")
+            fts_sql = None
+        if fts_sql is None:
+            conn.execute(
+                f"CREATE VIRTUAL TABLE {EVENT_FTS_TABLE} USING fts5("
+                f"message, content='Event', content_rowid='rowid', tokenize='{tokenizer}')"
+            )
+
+        rebuild = fts_sql is None or any(_sql(conn, "trigger", name) is None for name in _TRIGGERS)
+        if rebuild:
+            for name, body in _TRIGGERS.items():
+                conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+                conn.execute(f"CREATE TRIGGER {name} {body}")
+            conn.execute(f"INSERT INTO {EVENT_FTS_TABLE} ({EVENT_FTS_TABLE}) VALUES ('rebuild')")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    if rebuild:
+        (count,) = conn.execute("SELECT COUNT(*) FROM Event").fetchone()
+        print(f"✅ Indexed {count} Event messages for search")
+    return rebuild
+
+
+def _index_current(conn):
+    # The index only follows Event while all of its triggers exist
+    if _sql(conn, "table", EVENT_FTS_TABLE) is None:
+        return False
+    return all(_sql(conn, "trigger", name) is not None for name in _TRIGGERS)
+
+
+def search_events(conn, text, t0=None, t1=None, levels=None, limit=None):
+    # Event rows (TABLE_COLUMNS order) whose message contains `text`, with
+    # t0 <= ts <= t1 and level in `levels` (None: no limit), newest first
+    if len(text) >= TRIGRAM_MIN_LENGTH and _index_current(conn):
+        # A quoted FTS5 string is matched as a phrase, so operators and
+        # punctuation in `text` are taken literally
+        where = [f"rowid IN (SELECT rowid FROM {EVENT_FTS_TABLE} WHERE {EVENT_FTS_TABLE} MATCH ?)"]
+        params = ['"' + text.replace('"', '""') + '"']
+    else:
+        where = ["message LIKE ? ESCAPE '\\'"]
+        params = ["%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"]
+    time_where, time_params = _time_filter(t0, t1, levels)
+    where += time_where
+    params += time_params
+    sql = f"SELECT * FROM Event WHERE {' AND '.join(where)} ORDER BY ts DESC"
+    if limit is not None:
+        sql += f" LIMIT {int(limit)}"
+    return conn.execute(sql, params).fetchall()
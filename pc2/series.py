@@ -0,0 +1,117 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .parsers import TABLE_COLUMNS, TABLE_TYPES
+from .storage import CHECKPOINT_TABLE, _time_filter
+
+# ============================================================
+# NumPy time series with an LRU result cache
+# ============================================================
+# get_series reads one numeric column of a table over a ts window (a range
+# scan on the ts index) and returns two NumPy arrays:
+#
+#     ts, values = pc2.series.get_series(conn, "QDown", "Q2LEVEL", t0, t1)
+#
+# ts is int64 UTC epoch ms, values float64 with NaN for missing values.
+# Results are kept in a bounded LRU cache, so a dashboard re-requesting the
+# same window does not query SQLite again. The cache key includes the
+# table's version (its ingest checkpoint and newest rowid, per partition on
+# an attach_range connection), so after any append or rebuild the next
+# request queries SQLite again and evicts the table's older entries.
+# Connections are told apart by the files they have open (main and
+# attached, e.g. the partitions of attach_range); a purely in-memory
+# connection is not cached. The arrays are shared between callers and
+# therefore read-only.
+#
+# numpy is only imported by this module, like pc2.vectorized.
+SERIES_CACHE_SIZE = 64
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+cache_stats = {"hits": 0, "misses": 0}
+
+
+def _databases(conn):
+    # ((schema, file), ...) of the connection's databases ("" for in-memory)
+    return tuple((name, path) for _, name, path in conn.execute("PRAGMA database_list"))
+
+
+def _table_version(conn, table_name):
+    # Changes whenever rows are appended to or the table is rebuilt: its
+    # checkpoint and newest rowid in every schema holding the table itself.
+    # On an attach_range connection table_name is a TEMP VIEW over the
+    # partitions, which has neither, so each partition's table is read.
+    version = []
+    for _, schema, _ in conn.execute("PRAGMA database_list").fetchall():
+        if not conn.execute(
+            f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = ?", (table_name,)
+        ).fetchone():
+            continue
+        try:
+            checkpoint = conn.execute(
+                f"SELECT last_ts, rows_at_last FROM {schema}.{CHECKPOINT_TABLE} WHERE table_name = ?",
+                (table_name,),
+            ).fetchone()
+        except sqlite3.OperationalError:  # DB without checkpoints
+            checkpoint = None
+        (max_rowid,) = conn.execute(f"SELECT MAX(rowid) FROM {schema}.{table_name}").fetchone()
+        version.append((schema, checkpoint, max_rowid))
+    return tuple(version)
+
+
+def _query(conn, table_name, column, t0, t1):
+    where, params = _time_filter(t0, t1)
+    sql = f"SELECT ts, {column} FROM {table_name}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    rows = conn.execute(sql + " ORDER BY ts", params).fetchall()
+
+    if rows:
+        ts_values, column_values = zip(*rows)
+    else:
+        ts_values, column_values = (), ()
+    # None (NULL) becomes NaN
+    ts = np.array(ts_values, dtype=np.int64)
+    values = np.array(column_values, dtype=np.float64)
+    ts.flags.writeable = False
+    values.flags.writeable = False
+    return ts, values
+
+
+def get_series(conn, table_name, column, t0=None, t1=None, cache_size=SERIES_CACHE_SIZE):
+    # → (ts, values) of rows with t0 <= ts <= t1 (None: unbounded), ordered by ts
+    if column not in TABLE_COLUMNS[table_name] or column == "ts":
+        raise ValueError(f"{table_name} has no value column {column!r}")
+    if TABLE_TYPES[table_name][TABLE_COLUMNS[table_name].index(column)] == "TEXT":
+        raise ValueError(f"{table_name}.{column} is a TEXT column")
+
+    databases = _databases(conn)
+    if not any(path for _, path in databases):
+        return _query(conn, table_name, column, t0, t1)
+
+    key = (databases, table_name, column, t0, t1, _table_version(conn, table_name))
+    with _cache_lock:
+        result = _cache.get(key)
+        if result is not None:
+            _cache.move_to_end(key)
+            cache_stats["hits"] += 1
+            return result
+        cache_stats["misses"] += 1
+
+    result = _query(conn, table_name, column, t0, t1)
+    with _cache_lock:
+        # Entries of an older version of this table are dropped right away
+        for stale in [k for k in _cache if k[:2] == key[:2] and k[-1] != key[-1]]:
+            del _cache[stale]
+        _cache[key] = result
+        while len(_cache) > cache_size:
+            _cache.popitem(last=False)
+    return result
+
+
+def clear_series_cache():
+    with _cache_lock:
+        _cache.clear()
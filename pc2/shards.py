@@ -0,0 +1,129 @@
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+
+from .config import SHARD_DIR
+from .parsers import SUBSYSTEMS
+from .storage import append_tables, connect, load_checkpoints, write_tables
+
+# ============================================================
+# Per-subsystem shards
+# ============================================================
+# SQLite has one writer per file, so a single DB inserts the subsystems one
+# after another. Here every subsystem's tables live in their own file,
+# <root>/VLBI.<subsystem>.db, written by its own worker process, so the
+# inserts run side by side. Each shard has the usual tables, indexes and
+# checkpoints.
+#
+# <root>/VLBI.catalog.db lists the shards; open_catalog connects to it and
+# ATTACHes every shard, after which the tables are read by their plain names
+# (SQLite looks unqualified names up in every attached database):
+#
+#     conn = pc2.shards.open_catalog()
+#     conn.execute("SELECT ts, K1LEVEL FROM KDown WHERE ts >= ?", (t0,))
+#
+# Like pc2.parallel, scripts using write_shards need the main guard.
+SHARD_PREFIX = "VLBI."
+SHARD_SUFFIX = ".db"
+CATALOG_NAME = "catalog"
+SHARD_TABLE = "shard"
+
+
+def shard_path(subsystem, root=SHARD_DIR):
+    return os.path.join(root, f"{SHARD_PREFIX}{subsystem}{SHARD_SUFFIX}")
+
+
+def catalog_path(root=SHARD_DIR):
+    return shard_path(CATALOG_NAME, root)
+
+
+def split_by_subsystem(tables):
+    # {table_name: rows} → {subsystem: {table_name: rows}}
+    shards = {}
+    for subsystem, spec in SUBSYSTEMS.items():
+        shard_tables = {name: tables[name] for name in spec["tables"] if name in tables}
+        if shard_tables:
+            shards[subsystem] = shard_tables
+    return shards
+
+
+def _write_shard(path, tables, incremental):
+    # Runs in a worker process: one connection, one writer per shard file
+    conn = connect(path)
+    try:
+        if incremental:
+            return append_tables(conn, tables, load_checkpoints(conn))
+        write_tables(conn, tables)
+        return {table_name: len(rows) for table_name, rows in tables.items()}
+    finally:
+        conn.close()
+
+
+def _register(root, shards):
+    conn = sqlite3.connect(catalog_path(root))
+    try:
+        conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {SHARD_TABLE} (
+            subsystem TEXT PRIMARY KEY,
+            file_name TEXT,
+            tables TEXT
+        );
+        """)
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {SHARD_TABLE} VALUES (?, ?, ?)",
+            [
+                (subsystem, os.path.basename(shard_path(subsystem, root)), ",".join(SUBSYSTEMS[subsystem]["tables"]))
+                for subsystem in shards
+            ],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def write_shards(tables, root=SHARD_DIR, incremental=False, workers=None):
+    # Write (or with `incremental`, append after each shard's checkpoints)
+    # every subsystem's tables into its shard, one process per subsystem.
+    # → {table_name: rows written}
+    os.makedirs(root, exist_ok=True)
+    shards = split_by_subsystem(tables)
+    _register(root, shards)
+    written = {}
+    with ProcessPoolExecutor(workers or len(shards) or 1) as pool:
+        futures = [
+            pool.submit(_write_shard, shard_path(subsystem, root), shard_tables, incremental)
+            for subsystem, shard_tables in shards.items()
+        ]
+        for future in futures:
+            written.update(future.result())
+    return written
+
+
+def load_shard_checkpoints(root=SHARD_DIR):
+    # {table_name: (last_ts, rows_at_last)} of every shard, for skipping
+    # already-stored lines while parsing
+    checkpoints = {}
+    for subsystem in SUBSYSTEMS:
+        path = shard_path(subsystem, root)
+        if not os.path.exists(path):
+            continue
+        conn = sqlite3.connect(path)
+        try:
+            checkpoints.update(load_checkpoints(conn))
+        finally:
+            conn.close()
+    return checkpoints
+
+
+def open_catalog(root=SHARD_DIR):
+    # Connection to the catalog with every registered shard attached (as
+    # schema "shard_<subsystem>"); close it like any other connection.
+    conn = sqlite3.connect(catalog_path(root))
+    try:
+        shards = conn.execute(f"SELECT subsystem, file_name FROM {SHARD_TABLE} ORDER BY subsystem").fetchall()
+        for subsystem, file_name in shards:
+            conn.execute(f"ATTACH DATABASE ? AS shard_{subsystem}", (os.path.join(root, file_name),))
+    except Exception:
+        conn.close()
+        raise
+    return conn
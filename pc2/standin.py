@@ -0,0 +1,141 @@
+import random
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+from .config import PC1_PORT
+from .transfer import IDENTITY, available_encodings, choose_encoding, compress, header, parse_hello
+
+# ============================================================
+# Local PC1 stand-in
+# ============================================================
+# Serves a log over TCP like PC1 does: a client connects, the whole log is
+# sent, and the connection is closed. Point a script's PC1_IP/PC1_PORT at it
+# to exercise the receive path without the instrument PC. Optionally:
+#   bandwidth   - bytes per second (None: as fast as the socket allows)
+#   latency_s   - delay between accepting the connection and the first byte
+#   chunk_range - (min, max) size of each send(), to reproduce odd-sized reads
+#   drop_ratio  - share of connections cut at a random offset; with
+#                 drop_reset the cut is a TCP reset, otherwise a normal close
+# The random choices use `seed`, so a run can be repeated exactly.
+#
+# Compressed transfer: a client that sends the pc2.transfer hello within
+# `handshake_s` gets the log in the first of its encodings that the stand-in
+# offers (`encodings`), starting at the byte offset it asks for (to resume an
+# interrupted transfer); any other client gets the plain log, like from PC1.
+# handshake_s=0 skips the hello and always sends the plain log at once.
+DEFAULT_CHUNK_SIZE = 64 * 1024
+HANDSHAKE_S = 0.2
+MAX_HELLO_SIZE = 256
+
+
+class _LogHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        self.server.send_log(self.request)
+
+
+class StandInServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, data, address=("127.0.0.1", PC1_PORT), bandwidth=None, latency_s=0.0,
+                 chunk_range=None, drop_ratio=0.0, drop_reset=False, seed=None, encodings=None,
+                 handshake_s=HANDSHAKE_S):
+        super().__init__(address, _LogHandler)
+        self.data = bytes(data)
+        self.encodings = available_encodings() if encodings is None else list(encodings)
+        self.handshake_s = handshake_s
+        # encoding → compressed log, built on first use
+        self.payloads = {IDENTITY: self.data}
+        self.bandwidth = bandwidth
+        self.latency_s = latency_s
+        self.chunk_range = chunk_range
+        self.drop_ratio = drop_ratio
+        self.drop_reset = drop_reset
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.connections = 0
+
+    def _read_hello(self, client):
+        # → encodings the client accepts, or None for a plain (PC1-style) client
+        if not self.handshake_s:
+            return None
+        client.settimeout(self.handshake_s)
+        line = b""
+        try:
+            while not line.endswith(b"\n") and len(line) < MAX_HELLO_SIZE:
+                data = client.recv(MAX_HELLO_SIZE - len(line))
+                if not data:
+                    break
+                line += data
+        except socket.timeout:
+            pass
+        finally:
+            client.settimeout(None)
+        return parse_hello(line)
+
+    def _payload(self, request):
+        # → (encoding, bytes to send) for a hello (None: plain PC1-style client)
+        if request is None:
+            return IDENTITY, self.data
+        encoding = choose_encoding(request["accept"], self.encodings)
+        offset = min(request["offset"], len(self.data))
+        if offset:
+            # Resumed transfer: the rest of the log, compressed on its own
+            body = compress(self.data[offset:], encoding)
+        else:
+            with self.lock:
+                if encoding not in self.payloads:
+                    self.payloads[encoding] = compress(self.data, encoding)
+                body = self.payloads[encoding]
+        return encoding, header(encoding, len(self.data), offset) + body
+
+    def _plan(self, size):
+        # (chunk sizes, drop offset or None) for one connection
+        with self.lock:
+            self.connections += 1
+            r = random.Random(self.random.random())
+        drop_at = r.randrange(size) if size and r.random() < self.drop_ratio else None
+        end = size if drop_at is None else drop_at
+        sizes = []
+        sent = 0
+        while sent < end:
+            size = r.randint(*self.chunk_range) if self.chunk_range else DEFAULT_CHUNK_SIZE
+            size = min(size, end - sent)
+            sizes.append(size)
+            sent += size
+        return sizes, drop_at
+
+    def send_log(self, client):
+        encoding, payload = self._payload(self._read_hello(client))
+        sizes, drop_at = self._plan(len(payload))
+        if self.latency_s:
+            time.sleep(self.latency_s)
+
+        view = memoryview(payload)
+        start = time.perf_counter()
+        sent = 0
+        for size in sizes:
+            client.sendall(view[sent:sent + size])
+            sent += size
+            if self.bandwidth:
+                # Sleep until the bytes sent so far fit in the bandwidth budget
+                delay = sent / self.bandwidth - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+
+        if drop_at is not None:
+            print(f"✂ Dropped connection after {drop_at} of {len(payload)} bytes ({encoding})")
+            if self.drop_reset:
+                # SO_LINGER with a zero timeout makes close() send a RST
+                client.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+
+
+def start_server(data, address=("127.0.0.1", 0), **options):
+    # Run a StandInServer in a background thread; → (server, (ip, port)).
+    # Port 0 picks a free port. Stop it with server.shutdown(); server.server_close().
+    server = StandInServer(data, address, **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.server_address
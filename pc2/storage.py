@@ -0,0 +1,278 @@
+import os
+import sqlite3
+
+from .config import SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS, SQLITE_CACHE_SIZE
+from .parsers import TABLE_COLUMNS, TABLE_CONVERTERS, TABLE_TYPES, TS_INDEX, epoch_ms
+
+# Last ts stored per table, plus how many rows share it, so an incremental run
+# only appends what is new since the previous run. A table holding several
+# sources keeps one checkpoint per source, "<table>:<source>".
+CHECKPOINT_TABLE = "ingest_checkpoint"
+# Full-text index over Event.message (pc2.search)
+EVENT_FTS_TABLE = "Event_fts"
+
+# Time-window queries use the ts index; Event is also filtered by thread/level.
+DEFAULT_INDEXES = [("ts",)]
+TABLE_INDEXES = {
+    "Event": [("ts",), ("thread_id", "ts"), ("level", "ts")],
+}
+
+
+# ============================================================
+# Connect to DB, create tables, and insert data
+# ============================================================
+def connect(db_path, journal_mode=SQLITE_JOURNAL_MODE, synchronous=SQLITE_SYNCHRONOUS,
+            cache_size=SQLITE_CACHE_SIZE):
+    # Check if the directory exists (necessary for connection to succeed)
+    db_dir = os.path.dirname(db_path)
+    if db_dir and not os.path.exists(db_dir):
+        os.makedirs(db_dir)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute(f"PRAGMA journal_mode={journal_mode}")
+    conn.execute(f"PRAGMA synchronous={synchronous}")
+    conn.execute(f"PRAGMA cache_size={int(cache_size)}")
+    print(f"Connected to DB: {os.path.abspath(db_path)}")
+    return conn
+
+
+def create_table(conn, table_name):
+    # Every table is the header columns followed by its typed value columns.
+    cols_sql = ",\n    ".join(
+        f"{col} {sql_type}" for col, sql_type in zip(TABLE_COLUMNS[table_name], TABLE_TYPES[table_name])
+    )
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {table_name} (\n    {cols_sql}\n);")
+
+
+def create_indexes(conn, table_name):
+    for cols in TABLE_INDEXES.get(table_name, DEFAULT_INDEXES):
+        index_name = f"idx_{table_name}_{'_'.join(cols)}"
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({', '.join(cols)})")
+
+
+def insert_rows(conn, table_name, rows):
+    # Prepared INSERT over the row lists built by the parsers; the caller owns
+    # the transaction so a whole run commits once.
+    placeholders = ", ".join("?" for _ in TABLE_COLUMNS[table_name])
+    conn.executemany(f"INSERT INTO {table_name} VALUES ({placeholders})", rows)
+
+
+def write_tables(conn, tables):
+    # Drop and rebuild every parsed table to ensure a clean schema, in one transaction.
+    # A table without rows (e.g. no 43GHz block in this log) is skipped and
+    # keeps what it already holds.
+    _create_checkpoint_table(conn)
+    conn.commit()
+
+    conn.execute("BEGIN")
+    try:
+        for table_name, rows in tables.items():
+            if not rows:
+                continue
+            _drop_table(conn, table_name)
+            create_table(conn, table_name)
+            conn.execute(f"DELETE FROM {CHECKPOINT_TABLE} WHERE table_name = ?", (table_name,))
+            insert_rows(conn, table_name, rows)
+            # Indexes are built once after the bulk insert rather than row by row
+            create_indexes(conn, table_name)
+            _save_checkpoint(conn, table_name, rows, None)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    for table_name, rows in tables.items():
+        if rows:
+            print(f"✅ Inserted {len(rows)} rows into {table_name}")
+        else:
+            print(f"⚠ Skipping {table_name}: No data found.")
+
+
+# ============================================================
+# Incremental append with checkpoints
+# ============================================================
+def _create_checkpoint_table(conn):
+    conn.execute(f"""
+    CREATE TABLE IF NOT EXISTS {CHECKPOINT_TABLE} (
+        table_name TEXT PRIMARY KEY,
+        last_ts INTEGER,
+        rows_at_last INTEGER
+    );
+    """)
+
+
+def load_checkpoints(conn, stored_in=None):
+    # {table_name: (last_ts, rows_at_last)}
+    # stored_in maps a table kept in another layout to that layout's
+    # checkpoint (e.g. {"IFselector": "IFselector_runs", "KDown":
+    # "downconverter:K"}): the table then
+    # resumes from there, not from its per-sample table's own checkpoint,
+    # which the single-subsystem scripts keep moving independently.
+    _create_checkpoint_table(conn)
+    conn.commit()
+    # Checkpoints of tables that were dropped since are ignored.
+    existing = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    checkpoints = {}
+    for table_name, last_ts, rows_at_last in conn.execute(
+        f"SELECT table_name, last_ts, rows_at_last FROM {CHECKPOINT_TABLE}"
+    ):
+        if table_name.split(":")[0] in existing:
+            checkpoints[table_name] = (last_ts, rows_at_last)
+    for table_name, stored_key in (stored_in or {}).items():
+        checkpoints.pop(table_name, None)
+        if stored_key in checkpoints:
+            checkpoints[table_name] = checkpoints[stored_key]
+    return checkpoints
+
+
+def _next_checkpoint(new_rows, checkpoint):
+    # Checkpoint after storing new_rows on top of `checkpoint`. Without new
+    # rows the previous checkpoint (possibly None) stays as it was.
+    if not new_rows:
+        return checkpoint
+    last = new_rows[-1][TS_INDEX]
+    rows_at_last = 0
+    for row in reversed(new_rows):
+        if row[TS_INDEX] != last:
+            break
+        rows_at_last += 1
+    if checkpoint is not None and checkpoint[0] == last:
+        rows_at_last += checkpoint[1]
+    return (last, rows_at_last)
+
+
+def _save_checkpoint(conn, table_name, new_rows, checkpoint):
+    checkpoint = _next_checkpoint(new_rows, checkpoint)
+    if checkpoint is None:
+        return
+    conn.execute(
+        f"INSERT OR REPLACE INTO {CHECKPOINT_TABLE} VALUES (?, ?, ?)",
+        (table_name,) + tuple(checkpoint),
+    )
+
+
+def _rows_after(rows, checkpoint):
+    # Rows newer than the checkpoint. Rows stamped exactly at the checkpoint
+    # are skipped until as many as were already stored have been seen.
+    if checkpoint is None:
+        return rows
+    last, already_stored = checkpoint
+    new_rows = []
+    for row in rows:
+        ts = row[TS_INDEX]
+        if ts < last:
+            continue
+        if ts == last and already_stored > 0:
+            already_stored -= 1
+            continue
+        new_rows.append(row)
+    return new_rows
+
+
+def _checkpoint_from_table(conn, table_name):
+    # Tables written before checkpoints existed: resume after their newest row.
+    (last,) = conn.execute(f"SELECT MAX(ts) FROM {table_name}").fetchone()
+    if last is None:
+        return None
+    (rows_at_last,) = conn.execute(
+        f"SELECT COUNT(*) FROM {table_name} WHERE ts = ?", (last,)
+    ).fetchone()
+    return (last, rows_at_last)
+
+
+def _table_schema(conn, table_name):
+    # [(column, type), ...]; empty if the table does not exist
+    return [(r[1], r[2]) for r in conn.execute(f"PRAGMA table_info({table_name})")]
+
+
+def _time_filter(t0=None, t1=None, levels=None, t0_column="ts", t1_column="ts"):
+    # WHERE terms and parameters for t0 <= ts <= t1 (None: unbounded) and a
+    # level in `levels` (None: any). → (where, params), for the caller to
+    # extend and join with AND
+    where = []
+    params = []
+    if t0 is not None:
+        where.append(f"{t0_column} >= ?")
+        params.append(t0)
+    if t1 is not None:
+        where.append(f"{t1_column} <= ?")
+        params.append(t1)
+    if levels is not None:
+        where.append(f"level IN ({', '.join('?' for _ in levels)})")
+        params.extend(levels)
+    return where, params
+
+
+def _drop_table(conn, table_name):
+    # The Event_fts search index reads its messages from Event, so it is
+    # dropped with it; pc2.search.create_event_index builds it again.
+    if table_name == "Event":
+        conn.execute(f"DROP TABLE IF EXISTS {EVENT_FTS_TABLE}")
+    conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+
+
+def _migrate_table(conn, table_name, old_schema):
+    # Rebuild a table with an outdated schema, keeping its history: columns are
+    # matched by name and converted with the same rules as freshly parsed rows.
+    # Tables from before the ts column get it from their datetime and code.
+    old_columns = [col for col, _ in old_schema]
+    old_rows = conn.execute(f"SELECT * FROM {table_name}").fetchall()
+    _drop_table(conn, table_name)
+    create_table(conn, table_name)
+
+    columns = TABLE_COLUMNS[table_name]
+    sources = [old_columns.index(col) if col in old_columns else None for col in columns]
+    converters = TABLE_CONVERTERS[table_name]
+    new_rows = (
+        [None if src is None or old[src] is None else convert(old[src])
+         for src, convert in zip(sources, converters)]
+        for old in old_rows
+    )
+    if "ts" not in old_columns and "datetime" in old_columns and "code" in old_columns:
+        ts_index = columns.index("ts")
+        datetime_index, code_index = old_columns.index("datetime"), old_columns.index("code")
+        new_rows = list(new_rows)
+        for row, old in zip(new_rows, old_rows):
+            row[ts_index] = epoch_ms(old[datetime_index], old[code_index])
+    insert_rows(conn, table_name, new_rows)
+    print(f"Migrated {len(old_rows)} rows of {table_name} to the current schema")
+
+
+def append_tables(conn, tables, checkpoints, verbose=True, filtered=False):
+    # Append only rows after each table's checkpoint, all in one transaction.
+    # A table whose columns no longer match TABLE_COLUMNS/TABLE_TYPES is migrated.
+    # filtered=True: the caller already dropped the stored rows (follow mode
+    # tracks that per connection), so every row is appended and the
+    # checkpoints only carry the stored position forward.
+    _create_checkpoint_table(conn)
+    conn.commit()
+
+    inserted = {}
+    conn.execute("BEGIN")
+    try:
+        for table_name, rows in tables.items():
+            columns = TABLE_COLUMNS[table_name]
+            schema = _table_schema(conn, table_name)
+            if not schema:
+                create_table(conn, table_name)
+            elif schema != list(zip(columns, TABLE_TYPES[table_name])):
+                _migrate_table(conn, table_name, schema)
+            create_indexes(conn, table_name)
+
+            checkpoint = checkpoints.get(table_name)
+            if checkpoint is None:
+                checkpoint = _checkpoint_from_table(conn, table_name)
+
+            new_rows = rows if filtered else _rows_after(rows, checkpoint)
+            insert_rows(conn, table_name, new_rows)
+            _save_checkpoint(conn, table_name, new_rows, checkpoint)
+            inserted[table_name] = len(new_rows)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    if verbose:
+        for table_name, count in inserted.items():
+            print(f"✅ Appended {count} new rows to {table_name}")
+    return inserted
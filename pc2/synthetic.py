@@ -0,0 +1,128 @@
+import datetime
+import random
+
+from .config import (
+    LOG_ENCODING,
+    FRONTEND_THREAD_ID,
+    KDOWN_THREAD_ID,
+    QDOWN_THREAD_ID,
+    SXDOWN_THREAD_ID,
+    IF_SELECTOR_THREAD_ID,
+    VIDEOCONVERTER2_THREAD_ID,
+)
+from .parsers import FRONTEND_BANDS
+
+# ============================================================
+# Synthetic PC1 log generator
+# ============================================================
+# Lines in the formats PC1 writes, for benchmarks and the local PC1 stand-in:
+# multi-band Frontend [12], K/Q downconverters [11]/[14], SX [13], IF selector
+# [15], video converter 2 [4], WARN/ERROR/DEBUG events with Korean text, plus
+# heartbeat lines of other threads, blank lines and lines without a header.
+# A share of the channel lines uses full-width commas, as PC1 sometimes does.
+
+# Relative frequency of each line kind
+LINE_WEIGHTS = {
+    "frontend": 1,
+    "kdown": 1,
+    "qdown": 1,
+    "sxdown": 1,
+    "if_selector": 1,
+    "videoconverter2": 1,
+    "event": 1,
+    "heartbeat": 1,
+    "noise": 1,
+}
+
+EVENT_MESSAGES = [
+    "통신 오류 발생: timeout {n}",
+    "수신기 온도 경고 {n}K",
+    "LO lock lost on channel {n}",
+    "명령 재전송 {n}회",
+]
+
+
+def _values(r, n, fmt):
+    return [fmt(r) for _ in range(n)]
+
+
+def _frontend(r, comma):
+    blocks = []
+    for band in FRONTEND_BANDS:
+        vals = _values(r, 33, lambda r: f"{r.uniform(-5, 300):.2f}")
+        vals += ["VLBI", r.choice(["LHCP", "RHCP"]), "OFF", "ON", "OFF", "OFF", "IN"]
+        # Some bands report fewer than 40 values
+        blocks.append(band.upper().replace("GHZ", "GHz") + " " + comma.join(vals[:r.choice([40, 40, 40, 38])]))
+    return FRONTEND_THREAD_ID, "INFO", "Frontend status: " + " ".join(blocks)
+
+
+def _downconverter(r, comma, thread_id, n_channels, label):
+    att = comma.join(_values(r, n_channels, lambda r: str(r.randint(0, 30))))
+    level = comma.join(_values(r, n_channels, lambda r: f"{r.uniform(-30, 5):.1f}"))
+    lock = comma.join(_values(r, n_channels, lambda r: r.choice(["lck", "lck", "lck", "lc"])))
+    return thread_id, "INFO", f"{label}: att={att} level={level} lock={lock}"
+
+
+def _if_selector(r, comma):
+    att = comma.join(_values(r, 16, lambda r: str(r.randint(0, 30))))
+    out2in = comma.join(_values(r, 16, lambda r: str(r.randint(1, 16))))
+    level = comma.join(_values(r, 16, lambda r: f"{r.uniform(-30, 5):.1f}"))
+    return IF_SELECTOR_THREAD_ID, "INFO", f"IF Selector: att={att} out2in={out2in} level={level}"
+
+
+def _videoconverter2(r, comma):
+    att = comma.join(_values(r, 8, lambda r: str(r.randint(0, 30))))
+    frq = comma.join(_values(r, 8, lambda r: f"{r.uniform(500, 1000):.2f}"))
+    levell = comma.join(_values(r, 8, lambda r: f"{r.uniform(-30, 5):.1f}"))
+    levelu = comma.join(_values(r, 8, lambda r: f"{r.uniform(-30, 5):.1f}"))
+    lock = comma.join(_values(r, 8, lambda r: r.choice(["lck", "lck", "lc"])))
+    return (VIDEOCONVERTER2_THREAD_ID, "INFO",
+            f"VC2: att={att} frqall={frq} levell={levell} levelu={levelu} lock={lock}")
+
+
+def _event(r):
+    thread_id = r.choice(["3", KDOWN_THREAD_ID, IF_SELECTOR_THREAD_ID, "21"])
+    level = r.choice(["WARN", "WARN", "ERROR", "DEBUG"])
+    return thread_id, level, r.choice(EVENT_MESSAGES).format(n=r.randint(1, 99))
+
+
+def _line(r, kind, comma):
+    if kind == "frontend":
+        return _frontend(r, comma)
+    if kind == "kdown":
+        return _downconverter(r, comma, KDOWN_THREAD_ID, 4, "DownConverter")
+    if kind == "qdown":
+        return _downconverter(r, comma, QDOWN_THREAD_ID, 4, "DownConverter")
+    if kind == "sxdown":
+        return _downconverter(r, comma, SXDOWN_THREAD_ID, 3, "SX")
+    if kind == "if_selector":
+        return _if_selector(r, comma)
+    if kind == "videoconverter2":
+        return _videoconverter2(r, comma)
+    if kind == "event":
+        return _event(r)
+    return "7", "INFO", "heartbeat ok"
+
+
+def iter_log_lines(n_lines, seed=0, start=datetime.datetime(2025, 3, 1), fullwidth_ratio=0.05,
+                   weights=None):
+    # Yields n_lines log lines (str, without line ending) in time order.
+    r = random.Random(seed)
+    weights = weights or LINE_WEIGHTS
+    kinds = list(weights)
+    kind_weights = [weights[k] for k in kinds]
+    t = start
+    for _ in range(n_lines):
+        t += datetime.timedelta(milliseconds=r.randint(0, 700))
+        kind = r.choices(kinds, kind_weights)[0]
+        if kind == "noise":
+            yield "   " if r.random() < 0.5 else "garbage line without header"
+            continue
+        comma = "，" if r.random() < fullwidth_ratio else ","
+        thread_id, level, message = _line(r, kind, comma)
+        yield f"{t:%Y-%m-%d %H:%M:%S},{t.microsecond // 1000:03d} [{thread_id}] {level} - {message}"
+
+
+def generate_log(n_lines, seed=0, encoding=LOG_ENCODING, **kwargs):
+    # Whole log as PC1 sends it: CRLF line endings, CP949 bytes.
+    return "".join(line + "\r\n" for line in iter_log_lines(n_lines, seed, **kwargs)).encode(encoding)
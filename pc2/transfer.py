@@ -0,0 +1,159 @@
+import gzip
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; gzip/zlib are always available
+    zstandard = None
+
+# ============================================================
+# Compressed transfer negotiation
+# ============================================================
+# PC1 normally starts sending the plain log as soon as PC2 connects. With
+# negotiation enabled, PC2 first sends one hello line listing the encodings it
+# accepts, in order of preference, and the byte offset of the log to start at
+# (non-zero when resuming an interrupted transfer):
+#
+#     PC2 accept=zstd,gzip,zlib offset=0\n
+#
+# A sender that understands it answers with one header line naming the
+# encoding it chose ("identity" = uncompressed), the total (uncompressed) log
+# length and the offset it starts at, followed by the stream:
+#
+#     PC1 encoding=gzip length=4553646 offset=0\n<gzip stream of log[offset:]>
+#
+# A sender that ignores the hello just sends the plain log. Log lines start
+# with a date, never with the header, so the receiver tells the two apart
+# from the first bytes.
+HELLO_PREFIX = b"PC2 "
+HEADER_PREFIX = b"PC1 encoding="
+IDENTITY = "identity"
+# Longest header line a receiver waits for before treating the data as a plain log
+MAX_HEADER_SIZE = 128
+
+
+def available_encodings():
+    # Encodings this installation can compress and decompress, best first
+    encodings = ["gzip", "zlib"]
+    if zstandard is not None:
+        encodings.insert(0, "zstd")
+    return encodings
+
+
+def _fields(line):
+    # b"PC1 a=1 b=x,y" → {"a": "1", "b": "x,y"}
+    fields = {}
+    for token in line.decode("ascii", "replace").split()[1:]:
+        key, _, value = token.partition("=")
+        fields[key] = value
+    return fields
+
+
+def hello(accept, offset=0):
+    return HELLO_PREFIX + f"accept={','.join(accept) or IDENTITY} offset={offset}\n".encode("ascii")
+
+
+def parse_hello(line):
+    # → {"accept": [...], "offset": int}, or None if `line` is not a hello
+    if not line.startswith(HELLO_PREFIX):
+        return None
+    fields = _fields(line)
+    if "accept" not in fields:
+        return None
+    return {
+        "accept": [enc for enc in fields["accept"].split(",") if enc],
+        "offset": int(fields.get("offset") or 0),
+    }
+
+
+def header(encoding, length, offset=0):
+    return HEADER_PREFIX + f"{encoding} length={length} offset={offset}\n".encode("ascii")
+
+
+def choose_encoding(accept, offered):
+    # First encoding in the client's preference order that the sender offers
+    for encoding in accept:
+        if encoding in offered:
+            return encoding
+    return IDENTITY
+
+
+def compress(data, encoding):
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if encoding == "zlib":
+        return zlib.compress(data, 6)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return data
+
+
+def _decompressor(encoding):
+    # Object with .decompress(chunk) → bytes, fed one received chunk at a time
+    if encoding == "gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "zlib":
+        return zlib.decompressobj(zlib.MAX_WBITS)
+    if encoding == "zstd":
+        return zstandard.ZstdDecompressor().decompressobj()
+    raise ValueError(f"Unsupported transfer encoding: {encoding}")
+
+
+def decompress_chunks(chunks, stats=None):
+    # Reads the optional "PC1 encoding=" header from the first received bytes
+    # and yields the decompressed log, chunk by chunk. Without a header the
+    # chunks are passed through unchanged. `stats` (a dict), if given,
+    # receives "encoding", the "received" (on the wire) byte count, and the
+    # "length" and "offset" from the header (None without one).
+    if stats is None:
+        stats = {}
+    stats.update(encoding=IDENTITY, received=0, length=None, offset=None)
+    chunks = iter(chunks)
+
+    # Collect just enough bytes to decide whether there is a header, then the
+    # whole header line
+    head = b""
+    for chunk in chunks:
+        stats["received"] += len(chunk)
+        head += chunk
+        if not HEADER_PREFIX.startswith(head[:len(HEADER_PREFIX)]) or b"\n" in head \
+                or len(head) > MAX_HEADER_SIZE:
+            break
+    if not head.startswith(HEADER_PREFIX):
+        if head:
+            yield head
+        for chunk in chunks:
+            stats["received"] += len(chunk)
+            yield chunk
+        return
+
+    line, sep, rest = head.partition(b"\n")
+    if not sep:
+        if len(head) <= MAX_HEADER_SIZE:
+            raise ConnectionError("Connection closed inside the transfer header")
+        raise ValueError(f"Transfer header without end of line: {head[:MAX_HEADER_SIZE]!r}")
+    fields = _fields(line)
+    encoding = fields["encoding"]
+    stats.update(encoding=encoding, length=int(fields["length"]), offset=int(fields.get("offset") or 0))
+
+    if encoding == IDENTITY:
+        if rest:
+            yield rest
+        for chunk in chunks:
+            stats["received"] += len(chunk)
+            yield chunk
+        return
+
+    decompressor = _decompressor(encoding)
+    if rest:
+        yield decompressor.decompress(rest)
+    for chunk in chunks:
+        stats["received"] += len(chunk)
+        data = decompressor.decompress(chunk)
+        # An empty input chunk (a receive timeout in follow mode) is passed on
+        if data or not chunk:
+            yield data
+    if encoding != "zstd":
+        tail = decompressor.flush()
+        if tail:
+            yield tail
@@ -0,0 +1,221 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .config import LOG_UTC_OFFSET_S
+from .parsers import (
+    SUBSYSTEMS,
+    EVENT_LEVELS,
+    FRONTEND_BANDS,
+    FRONTEND_COLUMNS,
+    FRONTEND_CONVERTERS,
+    CHANNEL_SPECS,
+    header_pattern,
+    malformed_counts,
+    to_text,
+    to_real,
+    to_int,
+    to_lock,
+    _since_key,
+)
+
+# ============================================================
+# Vectorized parse engine (Arrow compute kernels + NumPy)
+# ============================================================
+# Produces the same tables as pc2.parse_lines, but works column by column: the
+# header is extracted for all lines with one regex kernel, each key=value block
+# with one extract per key, and every channel array is split, trimmed and
+# converted for all lines at once before being scattered into a preallocated
+# (lines x channels) NumPy matrix. Python only touches the finished rows.
+#
+# The kernels use RE2 (ASCII \d and \s), which matches the Python patterns for
+# everything PC1 writes. pyarrow/NumPy are only imported by this module, so the
+# default ingest path does not need them.
+
+# Strings float() accepts for finite numbers
+NUMBER_PATTERN = r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$"
+
+
+def _numpy(array):
+    return array.to_numpy(zero_copy_only=False)
+
+
+def _tokens(values, width):
+    # First `width` non-empty, trimmed comma-separated tokens of each value:
+    # (line index, position, tokens), like `[v.strip() for v in s.split(",") if v.strip()]`.
+    lists = pc.split_pattern(values, ",")
+    parents = _numpy(pc.list_parent_indices(lists))
+    tokens = pc.utf8_trim_whitespace(pc.list_flatten(lists))
+    keep = _numpy(pc.not_equal(tokens, "")).astype(bool)
+    parents = parents[keep]
+    tokens = tokens.filter(keep)
+    position = np.arange(len(parents)) - np.searchsorted(parents, parents, side="left")
+    inside = position < width
+    return parents[inside], position[inside], tokens.filter(inside)
+
+
+def _convert_tokens(tokens, convert):
+    # → float64 array (NaN = NULL) for numbers/locks, object array for text
+    if convert is to_text:
+        return _numpy(tokens).astype(object)
+    if convert is to_lock:
+        lower = pc.utf8_lower(tokens)
+        return np.select(
+            [_numpy(pc.match_substring(lower, "lck")), _numpy(pc.match_substring(lower, "lc"))],
+            [1.0, 0.0],
+            np.nan,
+        )
+    valid = pc.match_substring_regex(tokens, NUMBER_PATTERN)
+    numbers = _numpy(pc.cast(pc.if_else(valid, tokens, pa.scalar(None, pa.string())), pa.float64()))
+    numbers = np.where(np.isfinite(numbers), numbers, np.nan)
+    if convert is to_int:
+        numbers = np.where(numbers == np.floor(numbers), numbers, np.nan)
+    return numbers
+
+
+def _fill_block(n_lines, parents, position, tokens, labels, suffix, convert):
+    # Scatter converted tokens into an (n_lines x channels) object matrix
+    width = len(labels)
+    converted = _convert_tokens(tokens, convert)
+
+    if convert is to_text:
+        block = np.full((n_lines, width), None, dtype=object)
+        block[parents, position] = converted
+        return block
+
+    bad = np.isnan(converted)
+    for idx, count in enumerate(np.bincount(position[bad], minlength=width)):
+        if count:
+            malformed_counts[f"{labels[idx]}{suffix}"] += int(count)
+
+    matrix = np.full((n_lines, width), np.nan)
+    matrix[parents, position] = converted
+    missing = np.isnan(matrix)
+    if convert in (to_int, to_lock):
+        block = np.where(missing, 0, matrix).astype(np.int64).astype(object)
+    else:
+        block = matrix.astype(object)
+    block[missing] = None
+    return block
+
+
+def _rows(header, blocks):
+    return np.hstack(header + blocks).tolist()
+
+
+def _header_columns(ts, thread_id, level, mask):
+    return [
+        _numpy(ts.filter(mask)).astype(object).reshape(-1, 1),
+        _numpy(thread_id.filter(mask)).astype(object).reshape(-1, 1),
+        _numpy(level.filter(mask)).astype(object).reshape(-1, 1),
+    ]
+
+
+def _channel_rows(header, data, name):
+    spec = CHANNEL_SPECS[name]
+    labels = spec["labels"]
+    n_lines = len(data)
+    # Mark the key=value blocks exactly as parse_lines' findall reads them:
+    # left to right, where a value may swallow a following key
+    # ("att=1,2,3,4,level=5" is one att block)
+    keys = "|".join(key for key, _, _ in spec["keys"])
+    marked = pc.replace_substring_regex(data, rf"(?i)((?:{keys})={spec['values']})", "\x00\\1\x00")
+    blocks = []
+    for key, suffix, convert in spec["keys"]:
+        # Greedy prefix: the last marked `key=` block of the line wins
+        values = pc.struct_field(pc.extract_regex(marked, rf"(?is)^.*\x00{key}=(?P<v>[^\x00]*)\x00"), [0])
+        parents, position, tokens = _tokens(values, len(labels))
+        blocks.append(_fill_block(n_lines, parents, position, tokens, labels, suffix, convert))
+    return _rows(header, blocks)
+
+
+def _frontend_rows(header, data, tables):
+    # Mark every "<n>ghz" token, split the line into its band blocks and drop
+    # the text before the first band.
+    marked = pc.replace_substring_regex(data, r"(?i)(\d+ghz)", "\x00\\1\x01")
+    pieces = pc.split_pattern(marked, "\x00")
+    parents = _numpy(pc.list_parent_indices(pieces))
+    blocks = pc.list_flatten(pieces)
+    first = np.r_[True, parents[1:] != parents[:-1]]
+    parents = parents[~first]
+    blocks = blocks.filter(~first)
+    parts = pc.extract_regex(blocks, "(?s)^(?P<freq>[^\x01]*)\x01(?P<values>.*)$")
+    freqs = _numpy(pc.utf8_lower(pc.struct_field(parts, [0]))).astype(object)
+    values = pc.struct_field(parts, [1])
+
+    # Numeric columns come first, the status text columns after them
+    n_numeric = FRONTEND_CONVERTERS.index(to_text)
+    numeric_labels, text_labels = FRONTEND_COLUMNS[:n_numeric], FRONTEND_COLUMNS[n_numeric:]
+    for band in FRONTEND_BANDS:
+        in_band = freqs == band
+        n_rows = int(in_band.sum())
+        line_index, position, tokens = _tokens(values.filter(in_band), len(FRONTEND_COLUMNS))
+        numeric = position < n_numeric
+        text = ~numeric
+        blocks = [
+            _fill_block(n_rows, line_index[numeric], position[numeric], tokens.filter(numeric),
+                        numeric_labels, "", to_real),
+            _fill_block(n_rows, line_index[text], position[text] - n_numeric, tokens.filter(text),
+                        text_labels, "", to_text),
+        ]
+        band_header = [col[parents[in_band]] for col in header]
+        tables[f"frontend_{band}"].extend(_rows(band_header, blocks))
+
+
+def parse_lines_vectorized(lines, subsystems=None, checkpoints=None):
+    # Same arguments and result as pc2.parse_lines.
+    if subsystems is None:
+        subsystems = list(SUBSYSTEMS)
+    if checkpoints is None:
+        checkpoints = {}
+    malformed_counts.clear()
+
+    tables = {table_name: [] for name in subsystems for table_name in SUBSYSTEMS[name]["tables"]}
+
+    lines = pc.utf8_trim_whitespace(pa.array(list(lines), pa.string()))
+    head = pc.extract_regex(lines, header_pattern.pattern)
+    head = head.filter(pc.is_valid(head))
+    datetime_col, code, thread_str, level, rest = (pc.struct_field(head, [i]) for i in range(5))
+
+    # ts = epoch ms of the (KST) datetime + millisecond code
+    seconds = pc.strptime(
+        pc.replace_substring_regex(datetime_col, r"\s+", " "), format="%Y-%m-%d %H:%M:%S", unit="s", error_is_null=True
+    )
+    ts = pc.subtract(
+        pc.add(pc.multiply(pc.cast(seconds, pa.int64()), 1000), pc.cast(code, pa.int64())),
+        LOG_UTC_OFFSET_S * 1000,
+    )
+    thread_id = pc.cast(thread_str, pa.int64())
+    valid = pc.is_valid(ts)
+
+    if "Event" in subsystems:
+        mask = pc.and_(valid, pc.is_in(pc.utf8_upper(level), pa.array(sorted(EVENT_LEVELS))))
+        since = _since_key(SUBSYSTEMS["Event"], checkpoints)
+        if since is not None:
+            mask = pc.and_(mask, pc.greater_equal(ts, since))
+        message = _numpy(rest.filter(mask)).astype(object).reshape(-1, 1)
+        tables["Event"] = _rows(_header_columns(ts, thread_id, level, mask), [message])
+
+    data = pc.utf8_trim_whitespace(pc.replace_substring_regex(rest, r"^[:\s-]*", ""))
+    data = pc.replace_substring(data, "，", ",")
+
+    for name in subsystems:
+        sub = SUBSYSTEMS[name]
+        if sub["thread_id"] is None:
+            continue
+        mask = pc.and_(valid, pc.and_(pc.equal(thread_str, sub["thread_id"]), pc.not_equal(data, "")))
+        if sub["levels"] is not None:
+            mask = pc.and_(mask, pc.is_in(level, pa.array(sorted(sub["levels"]))))
+        since = _since_key(sub, checkpoints)
+        if since is not None:
+            mask = pc.and_(mask, pc.greater_equal(ts, since))
+
+        header = _header_columns(ts, thread_id, level, mask)
+        if name == "Frontend":
+            _frontend_rows(header, data.filter(mask), tables)
+        else:
+            tables[sub["tables"][0]] = _channel_rows(header, data.filter(mask), name)
+
+    if malformed_counts:
+        print(f"⚠ {sum(malformed_counts.values())} malformed values stored as NULL: {dict(malformed_counts)}")
+    return tables
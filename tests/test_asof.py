@@ -0,0 +1,27 @@
+import pc2
+import pc2.asof
+
+LOG = [
+    "2025-03-01 00:00:01,000 [3] ERROR - before any sample\r\n",
+    "2025-03-01 00:00:02,000 [11] INFO - DownConverter: att=1,2,3,4 lock=lck\r\n",
+    "2025-03-01 00:00:02,000 [11] INFO - DownConverter: att=2,2,3,4 lock=lc\r\n",
+    "2025-03-01 00:00:02,000 [3] ERROR - same ms as the samples\r\n",
+    "2025-03-01 00:00:03,000 [3] WARN - a second later\r\n",
+    "2025-03-01 00:00:09,000 [3] ERROR - long after\r\n",
+]
+
+
+def test_events_get_the_newest_sample_at_or_before_them(tmp_path):
+    conn = pc2.connect(str(tmp_path / "asof.db"))
+    pc2.write_tables(conn, pc2.parse_lines(LOG, ["KDown", "Event"]))
+    t2 = pc2.epoch_ms("2025-03-01 00:00:02", "000")
+
+    joined = pc2.asof.events_with_samples(conn, {"KDown": ["K1ATT", "K1LOCK"]}, levels=["ERROR"], max_age_ms=5000)
+    # Of the samples sharing a ts, the last stored one
+    assert [(event[-1], samples["KDown"]) for event, samples in joined] == [
+        ("before any sample", None),
+        ("same ms as the samples", (t2, 2.0, 0)),
+        ("long after", None),
+    ]
+    assert pc2.asof.asof_samples(conn, [t2 + 1000, t2 - 1], "KDown", ["K1ATT"]) == [(t2, 2.0), None]
+    conn.close()
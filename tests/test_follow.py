@@ -0,0 +1,55 @@
+import pc2
+from pc2.standin import start_server
+
+LOG = (
+    "2025-03-01 00:00:00,001 [11] ERROR - first\r\n"
+    "2025-03-01 00:00:00,001 [13] ERROR - second\r\n"
+    "2025-03-01 00:00:00,002 [11] ERROR - third\r\n"
+).encode("cp949")
+
+
+def _follow(db_path, max_connections):
+    server, (ip, port) = start_server(LOG, handshake_s=0)
+    try:
+        conn = pc2.connect(str(db_path))
+        pc2.follow(conn, ["Event"], ip, port, batch_lines=1, batch_ms=50,
+                   reconnect_s=0.01, max_connections=max_connections)
+        rows = conn.execute("SELECT ts % 1000, message FROM Event ORDER BY rowid").fetchall()
+        conn.close()
+        return rows
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_same_ts_rows_split_across_batches(tmp_path):
+    # One line per batch: "second" shares the last stored ts with "first"
+    assert _follow(tmp_path / "follow.db", 1) == [(1, "first"), (1, "second"), (2, "third")]
+
+
+def test_reconnect_skips_resent_lines(tmp_path):
+    # PC1 sends the whole log again on every connection
+    assert _follow(tmp_path / "follow.db", 3) == [(1, "first"), (1, "second"), (2, "third")]
+
+
+def test_negotiated_reconnect_resumes_at_offset():
+    # The trailing partial line is left for the next connection, which only
+    # receives the log from there
+    tail = "2025-03-01 00:00:00,003 [11] ERROR - fourth\r\n".encode("cp949")
+    server, (ip, port) = start_server(LOG + tail[:10], handshake_s=1.0)
+    try:
+        position = {}
+        lines = [line for line in pc2.follow_lines(ip, port, tick=0.05, negotiate=True, position=position)
+                 if line is not None]
+        assert [line.split(" - ")[1] for line in lines] == ["first\r\n", "second\r\n", "third\r\n"]
+        assert position["offset"] == len(LOG)
+
+        server.data = LOG + tail
+        server.payloads = {"identity": server.data}
+        lines = [line for line in pc2.follow_lines(ip, port, tick=0.05, negotiate=True, position=position)
+                 if line is not None]
+        assert lines == [tail.decode("cp949")]
+        assert position["offset"] == len(LOG + tail)
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,68 @@
+import pc2
+import pc2.normalized
+
+KDOWN = "2025-03-01 00:00:00,100 [11] INFO - DownConverter: att=15,24,14,15 level=-7.2,-2.4,-26.7,-29.0 lock=lc,lc,lck,lc\r\n"
+QDOWN = "2025-03-01 00:00:00,200 [14] INFO - DownConverter: att=1,2,3,4 level=-1.0,-2.0,-3.0,-4.0 lock=lck,lck,lck,lck\r\n"
+TABLES = ["KDown", "QDown"]
+
+
+def _kdown(n):
+    # One KDown line per second, its K1 att counting up
+    return f"2025-03-01 00:00:0{n},000 [11] INFO - DownConverter: att={n},2,3,4 lock=lck\r\n"
+
+
+def _k1_att(conn):
+    return [att for (att,) in conn.execute("SELECT att FROM downconverter WHERE channel = 'K1' ORDER BY ts")]
+
+
+def _bands(conn):
+    return conn.execute("SELECT band, COUNT(*) FROM downconverter GROUP BY band ORDER BY band").fetchall()
+
+
+def test_rebuild_keeps_bands_without_rows(tmp_path):
+    conn = pc2.connect(str(tmp_path / "normalized.db"))
+    pc2.normalized.write_normalized(conn, pc2.parse_lines([KDOWN, QDOWN], TABLES))
+    # No KDown line in the second log
+    pc2.normalized.write_normalized(conn, pc2.parse_lines([QDOWN], TABLES))
+    assert _bands(conn) == [("K", 4), ("Q", 4)]
+    assert set(TABLES) <= set(pc2.load_checkpoints(conn, stored_in=pc2.normalized.NORMALIZED_STORED_IN))
+    conn.close()
+
+
+def test_schema_change_keeps_rows(tmp_path):
+    conn = pc2.connect(str(tmp_path / "normalized.db"))
+    pc2.normalized.write_normalized(conn, pc2.parse_lines([KDOWN], TABLES))
+    # A table from an older layout, without the lock column
+    conn.execute("ALTER TABLE downconverter DROP COLUMN lock")
+    conn.commit()
+    pc2.normalized.append_normalized(conn, pc2.parse_lines([QDOWN], TABLES), verbose=False)
+    assert _bands(conn) == [("K", 4), ("Q", 4)]
+    assert conn.execute("SELECT lock FROM downconverter WHERE band = 'Q'").fetchall() == [(1,)] * 4
+    conn.close()
+
+
+def test_normalized_resume_after_per_sample_writes(tmp_path):
+    # The Kdown script stores further on in the per-sample KDown table; the
+    # K band still resumes from its own position
+    conn = pc2.connect(str(tmp_path / "normalized.db"))
+    stored_in = pc2.normalized.NORMALIZED_STORED_IN
+    pc2.normalized.write_normalized(conn, pc2.parse_lines([_kdown(n) for n in (1, 2)], ["KDown"]))
+    pc2.write_tables(conn, pc2.parse_lines([_kdown(n) for n in (1, 2, 3, 4)], ["KDown"]))
+
+    tables = pc2.parse_lines([_kdown(n) for n in range(1, 6)], ["KDown"], pc2.load_checkpoints(conn, stored_in))
+    pc2.normalized.append_normalized(conn, tables, verbose=False)
+    assert _k1_att(conn) == [1, 2, 3, 4, 5]
+    conn.close()
+
+
+def test_per_sample_resume_after_normalized_writes(tmp_path):
+    # The reverse: a normalized rebuild does not move the KDown table's position
+    conn = pc2.connect(str(tmp_path / "normalized.db"))
+    pc2.write_tables(conn, pc2.parse_lines([_kdown(n) for n in (1, 2)], ["KDown"]))
+    pc2.normalized.write_normalized(conn, pc2.parse_lines([_kdown(n) for n in (1, 2, 3, 4)], ["KDown"]))
+
+    checkpoints = pc2.load_checkpoints(conn)
+    tables = pc2.parse_lines([_kdown(n) for n in range(1, 6)], ["KDown"], checkpoints)
+    pc2.append_tables(conn, tables, checkpoints, verbose=False)
+    assert conn.execute("SELECT K1ATT FROM KDown ORDER BY ts").fetchall() == [(n,) for n in range(1, 6)]
+    conn.close()
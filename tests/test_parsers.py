@@ -0,0 +1,14 @@
+import pc2
+from pc2.synthetic import generate_log
+
+
+def test_parse_buffer_matches_parse_lines():
+    # Both entry points share the routing; only the header matching differs
+    buffer = generate_log(3000, seed=3)
+    lines = pc2.decode_log(buffer)
+    assert pc2.parse_buffer(buffer) == pc2.parse_lines(lines)
+
+    checkpoints = {"KDown": (pc2.parse_lines(lines[:1000], ["KDown"])["KDown"][-1][0], 1)}
+    assert pc2.parse_buffer(buffer, ["KDown", "Event"], checkpoints) == pc2.parse_lines(
+        lines, ["KDown", "Event"], checkpoints
+    )
@@ -0,0 +1,28 @@
+import pc2
+import pc2.partitions
+
+
+def _kdown(day, second):
+    return f"2025-03-0{day} 12:00:{second:02d},000 [11] INFO - DownConverter: att={day}{second},2,3,4\r\n"
+
+
+def _store(lines, root):
+    for _, conn, day_tables in pc2.partitions.open_partitions(pc2.parse_lines(lines, ["KDown"]), root=root):
+        pc2.append_tables(conn, day_tables, pc2.load_checkpoints(conn), verbose=False)
+
+
+def test_days_are_stored_and_read_back_across_partitions(tmp_path):
+    root = str(tmp_path)
+    _store([_kdown(1, 0), _kdown(1, 1), _kdown(2, 0)], root)
+    assert [date for date, _ in pc2.partitions.list_partitions(root)] == ["2025-03-01", "2025-03-02"]
+    assert [row[0] for row in pc2.partitions.read_range("KDown", columns=["K1ATT"], root=root)] == [10, 11, 20]
+
+    # Sealed days are skipped; the newest day still takes appends
+    assert pc2.partitions.seal_partitions("2025-03-02", root=root) == ["2025-03-01"]
+    _store([_kdown(1, 2), _kdown(2, 1)], root)
+    checkpoints = pc2.partitions.load_partition_checkpoints(root=root)
+    assert checkpoints["KDown"] == (pc2.epoch_ms("2025-03-02 12:00:01", "000"), 1)
+
+    conn = pc2.partitions.attach_range(root=root)
+    assert conn.execute("SELECT K1ATT FROM KDown ORDER BY ts").fetchall() == [(10,), (11,), (20,), (21,)]
+    conn.close()
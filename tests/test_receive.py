@@ -0,0 +1,42 @@
+import threading
+
+import pytest
+
+import pc2
+from pc2.standin import StandInServer, start_server
+from pc2.transfer import IDENTITY, header
+
+LOG = b"".join(
+    f"2025-03-01 00:00:{n % 60:02d},000 [3] ERROR - message {n}\r\n".encode("cp949") for n in range(2000)
+)
+
+
+def test_dropped_transfers_resume():
+    # The first connection is cut (seed 2); the retry asks for the rest only
+    server, (ip, port) = start_server(LOG, drop_ratio=0.5, seed=2, encodings=[], chunk_range=(100, 5000))
+    try:
+        buffer = pc2.receive_log(ip, port, negotiate=True, retries=20)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert buffer == LOG
+    assert server.connections > 1
+
+
+class _SkippingServer(StandInServer):
+    # Answers every hello from a later offset than asked for
+    def _payload(self, request):
+        return IDENTITY, header(IDENTITY, len(self.data), 100) + self.data[100:]
+
+
+def test_resume_past_the_requested_offset_is_not_retried():
+    server = _SkippingServer(LOG, ("127.0.0.1", 0))
+    try:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        ip, port = server.server_address
+        with pytest.raises(ValueError, match="resumed at 100"):
+            pc2.receive_log(ip, port, negotiate=True, retries=3)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert server.connections == 1
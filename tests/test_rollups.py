@@ -0,0 +1,42 @@
+import pc2
+import pc2.rollups
+
+
+def _kdown(second, att):
+    minute, second = divmod(second, 60)
+    return f"2025-03-01 00:0{minute}:{second:02d},000 [11] INFO - DownConverter: att={att},2,3,4 lock=lck,lc\r\n"
+
+
+def test_rollups_follow_appends(tmp_path):
+    conn = pc2.connect(str(tmp_path / "rollups.db"))
+    pc2.write_tables(conn, pc2.parse_lines([_kdown(0, 1), _kdown(30, 3)], ["KDown"]))
+    assert pc2.rollups.update_rollups(conn, ["KDown"], verbose=False) == {"KDown": 2}
+
+    # One more sample in the first minute, one in the second
+    checkpoints = pc2.load_checkpoints(conn)
+    tables = pc2.parse_lines([_kdown(45, 5), _kdown(61, 7)], ["KDown"], checkpoints)
+    pc2.append_tables(conn, tables, checkpoints, verbose=False)
+    assert pc2.rollups.update_rollups(conn, ["KDown"], verbose=False) == {"KDown": 2}
+
+    minute = 60_000
+    (t0,) = conn.execute("SELECT MIN(ts) FROM KDown").fetchone()
+    assert pc2.rollups.read_rollup(conn, "KDown", "K1ATT") == [
+        (t0, 1.0, 5.0, 3.0, 3),
+        (t0 + minute, 7.0, 7.0, 7.0, 1),
+    ]
+    assert pc2.rollups.read_rollup(conn, "KDown", "K1ATT", t0=t0 + 1) == [(t0 + minute, 7.0, 7.0, 7.0, 1)]
+    assert pc2.rollups.read_rollup(conn, "KDown", "K2LOCK", t1=t0) == [(t0, 3, 3)]
+    conn.close()
+
+
+def test_rolled_up_count_skips_deleted_rows(tmp_path):
+    conn = pc2.connect(str(tmp_path / "rollups.db"))
+    pc2.write_tables(conn, pc2.parse_lines([_kdown(0, 1)], ["KDown"]))
+    pc2.rollups.update_rollups(conn, ["KDown"], verbose=False)
+    checkpoints = pc2.load_checkpoints(conn)
+    tables = pc2.parse_lines([_kdown(n, n) for n in range(1, 5)], ["KDown"], checkpoints)
+    pc2.append_tables(conn, tables, checkpoints, verbose=False)
+    conn.execute("DELETE FROM KDown WHERE K1ATT IN (2, 3)")
+    conn.commit()
+    assert pc2.rollups.update_rollups(conn, ["KDown"], verbose=False) == {"KDown": 2}
+    conn.close()
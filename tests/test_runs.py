@@ -0,0 +1,51 @@
+import pc2
+import pc2.runs
+
+KDOWN = "2025-03-01 00:00:00,100 [11] INFO - DownConverter: att=15,24,14,15 level=-7.2,-2.4,-26.7,-29.0 lock=lc,lc,lck,lc\r\n"
+VC2 = "2025-03-01 00:00:00,200 [4] INFO - VC2: att=1,2,3,4,5,6,7,8 lock=lck,lck,lck,lck,lck,lck,lck,lck\r\n"
+TABLES = ["KDown", "VideoConverter2"]
+
+
+def _vc2(n):
+    # One VideoConverter2 line per second, its att values counting up
+    return f"2025-03-01 00:00:0{n},000 [4] INFO - VC2: att={n},2,3,4,5,6,7,8 lock=lck\r\n"
+
+
+def test_rebuild_keeps_tables_without_rows(tmp_path):
+    conn = pc2.connect(str(tmp_path / "runs.db"))
+    pc2.runs.write_runs(conn, pc2.parse_lines([KDOWN, VC2, VC2], TABLES))
+    # No VideoConverter2 line in the second log
+    pc2.runs.write_runs(conn, pc2.parse_lines([KDOWN], TABLES))
+    assert conn.execute("SELECT samples FROM VideoConverter2_runs").fetchall() == [(2,)]
+    assert conn.execute("SELECT COUNT(*) FROM VideoConverter2_expanded").fetchone() == (2,)
+    checkpoints = pc2.load_checkpoints(conn, stored_in=pc2.runs.runs_stored_in(TABLES))
+    assert {"VideoConverter2", "VideoConverter2_runs"} <= set(checkpoints)
+    conn.close()
+
+
+def test_runs_resume_after_per_sample_writes(tmp_path):
+    # The VideoConverter2 script stores further on in the per-sample table;
+    # the runs table still resumes from its own position
+    conn = pc2.connect(str(tmp_path / "runs.db"))
+    stored_in = pc2.runs.runs_stored_in(["VideoConverter2"])
+    pc2.runs.write_runs(conn, pc2.parse_lines([_vc2(n) for n in (1, 2)], ["VideoConverter2"]))
+    pc2.write_tables(conn, pc2.parse_lines([_vc2(n) for n in (1, 2, 3, 4)], ["VideoConverter2"]))
+
+    checkpoints = pc2.load_checkpoints(conn, stored_in)
+    tables = pc2.parse_lines([_vc2(n) for n in range(1, 6)], ["VideoConverter2"], checkpoints)
+    pc2.runs.append_runs(conn, tables, checkpoints, verbose=False)
+    assert [row[3] for row in pc2.runs.expand_runs(conn, "VideoConverter2")] == [1, 2, 3, 4, 5]
+    conn.close()
+
+
+def test_per_sample_resume_after_runs_writes(tmp_path):
+    # The reverse: a runs rebuild does not move the per-sample table's position
+    conn = pc2.connect(str(tmp_path / "runs.db"))
+    pc2.write_tables(conn, pc2.parse_lines([_vc2(n) for n in (1, 2)], ["VideoConverter2"]))
+    pc2.runs.write_runs(conn, pc2.parse_lines([_vc2(n) for n in (1, 2, 3, 4)], ["VideoConverter2"]))
+
+    checkpoints = pc2.load_checkpoints(conn)
+    tables = pc2.parse_lines([_vc2(n) for n in range(1, 6)], ["VideoConverter2"], checkpoints)
+    pc2.append_tables(conn, tables, checkpoints, verbose=False)
+    assert conn.execute("SELECT CH9ATT FROM VideoConverter2 ORDER BY ts").fetchall() == [(n,) for n in range(1, 6)]
+    conn.close()
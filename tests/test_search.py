@@ -0,0 +1,34 @@
+import pc2
+import pc2.search
+
+LOG = [
+    "2025-03-01 00:00:01,000 [3] ERROR - 통신 오류 발생: timeout 1\r\n",
+    "2025-03-01 00:00:02,000 [3] WARN - 수신기 온도 경고 20K\r\n",
+    "2025-03-01 00:00:03,000 [3] ERROR - LO lock lost on channel 2\r\n",
+]
+
+
+def _messages(rows):
+    return [row[-1] for row in rows]
+
+
+def test_search_finds_substrings_and_follows_appends(tmp_path):
+    conn = pc2.connect(str(tmp_path / "search.db"))
+    pc2.write_tables(conn, pc2.parse_lines(LOG[:2], ["Event"]))
+    assert pc2.search.create_event_index(conn)
+    assert _messages(pc2.search.search_events(conn, "오류 발")) == ["통신 오류 발생: timeout 1"]
+
+    # Appends are indexed by the triggers
+    checkpoints = pc2.load_checkpoints(conn)
+    pc2.append_tables(conn, pc2.parse_lines(LOG, ["Event"], checkpoints), checkpoints, verbose=False)
+    assert _messages(pc2.search.search_events(conn, "lock lo", levels=["ERROR"])) == ["LO lock lost on channel 2"]
+    conn.close()
+
+
+def test_missing_tokenizer_skips_the_index(tmp_path):
+    # An SQLite build without the tokenizer (e.g. trigram before 3.34)
+    conn = pc2.connect(str(tmp_path / "search.db"))
+    pc2.write_tables(conn, pc2.parse_lines(LOG, ["Event"]))
+    assert not pc2.search.create_event_index(conn, tokenizer="no_such_tokenizer")
+    assert _messages(pc2.search.search_events(conn, "온도")) == ["수신기 온도 경고 20K"]
+    conn.close()
@@ -0,0 +1,31 @@
+import pytest
+
+import pc2
+import pc2.partitions
+
+pytest.importorskip("numpy")
+import pc2.series  # noqa: E402
+
+
+def _kdown(day, ms):
+    return f"2025-03-0{day} 12:00:00,{ms:03d} [11] INFO - DownConverter: att=1,2,3,4 level=-{ms}.0,-2,-3,-4\r\n"
+
+
+def test_attached_partition_append_invalidates_cache(tmp_path):
+    # Two days, so the appended (newest) partition is not the one whose
+    # checkpoint a UNION view would return first
+    tables = pc2.parse_lines([_kdown(1, 1), _kdown(2, 1), _kdown(2, 2)], ["KDown"])
+    for _, conn, day_tables in pc2.partitions.open_partitions(tables, root=str(tmp_path)):
+        pc2.write_tables(conn, day_tables)
+
+    reader = pc2.partitions.attach_range(root=str(tmp_path))
+    ts, values = pc2.series.get_series(reader, "KDown", "K1LEVEL")
+    assert list(values) == [-1.0, -1.0, -2.0]
+
+    tables = pc2.parse_lines([_kdown(2, 3)], ["KDown"])
+    for _, conn, day_tables in pc2.partitions.open_partitions(tables, root=str(tmp_path)):
+        pc2.append_tables(conn, day_tables, pc2.load_checkpoints(conn), verbose=False)
+
+    ts, values = pc2.series.get_series(reader, "KDown", "K1LEVEL")
+    assert list(values) == [-1.0, -1.0, -2.0, -3.0]
+    reader.close()
@@ -0,0 +1,30 @@
+import pc2
+import pc2.search
+import pc2.shards
+
+LOG = [
+    "2025-03-01 00:00:01,000 [11] INFO - DownConverter: att=1,2,3,4\r\n",
+    "2025-03-01 00:00:01,500 [3] ERROR - 통신 오류 발생: timeout 1\r\n",
+    "2025-03-01 00:00:02,000 [14] INFO - DownConverter: att=5,6,7,8\r\n",
+]
+
+
+def test_shards_are_written_and_read_through_the_catalog(tmp_path):
+    root = str(tmp_path)
+    tables = pc2.parse_lines(LOG[:2], ["KDown", "QDown", "Event"])
+    pc2.shards.write_shards(tables, root=root)
+    # Incremental: each shard resumes from its own checkpoints
+    checkpoints = pc2.shards.load_shard_checkpoints(root)
+    tables = pc2.parse_lines(LOG, ["KDown", "QDown", "Event"], checkpoints)
+    assert pc2.shards.write_shards(tables, root=root, incremental=True) == {"KDown": 0, "QDown": 1, "Event": 0}
+
+    conn = pc2.shards.open_catalog(root)
+    assert conn.execute("SELECT K1ATT FROM KDown").fetchall() == [(1,)]
+    assert conn.execute("SELECT Q1ATT FROM QDown").fetchall() == [(5,)]
+    conn.close()
+
+    # The search index is built in the Event shard
+    conn = pc2.connect(pc2.shards.shard_path("Event", root))
+    assert pc2.search.create_event_index(conn)
+    assert len(pc2.search.search_events(conn, "오류 발")) == 1
+    conn.close()
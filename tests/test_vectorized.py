@@ -0,0 +1,20 @@
+import pytest
+
+import pc2
+
+pytest.importorskip("pyarrow")
+from pc2.vectorized import parse_lines_vectorized  # noqa: E402
+
+LINES = [
+    "2025-03-01 00:00:00,137 [11] INFO - DownConverter: att=15,24,14,15 level=-7.2,-2.4,-26.7,-29.0 lock=lc,lc,lck,lc\r\n",
+    # CHANNEL_VALUES takes letters, so the att block swallows "level"
+    "2025-03-01 00:00:00,200 [11] INFO - DownConverter: att=1,2,3,4,level=5,6,7,8 lock=lck\r\n",
+    # A repeated key keeps its last block
+    "2025-03-01 00:00:00,300 [11] INFO - DownConverter: att=1,2,3,4 att=9,9,9,9 LEVEL=1.5\r\n",
+]
+
+
+def test_channel_rows_match_parse_lines():
+    expected = pc2.parse_lines(LINES, ["KDown"])
+    assert parse_lines_vectorized(LINES, ["KDown"]) == expected
+    assert expected["KDown"][1][7:11] == [None] * 4